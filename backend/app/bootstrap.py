@@ -0,0 +1,135 @@
+"""One-shot deploy bootstrap and per-worker warm-up.
+
+``python -m app.bootstrap`` creates extensions and tables, applies pending
+migrations, seeds the default data and geocodes jobs that have no
+coordinates yet. It runs once per deploy, under the migration advisory
+lock, so concurrent deploys queue up instead of racing on DDL. Workers
+then only call ``warm_up()``, which opens pool connections ahead of
+traffic and runs the statements the hot handlers send once on each. That
+fills SQLAlchemy's compiled cache and asyncpg's per-connection
+prepared-statement cache.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from .core.config import settings
+from .database import AsyncSessionLocal, engine, read_router
+from .migrations import migration_lock
+from .models import JobSectorEnum, WorkTypeEnum
+from .routers.jobs import _company_query, _employer_jobs_query, _job_detail_query, _jobs_query
+from .services.facets import facet_query
+from .services.geo import geocode_missing_jobs
+from .services.job_filters import JobFilters
+from .services.pagination import encode_cursor
+from .services.redirects import record_clicks_statement
+from .services.seed_data import init_db, seed_default_data
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_ID = "00000000-0000-0000-0000-000000000000"
+
+
+async def bootstrap(seed: bool = True) -> None:
+    async with migration_lock():
+        await init_db()
+        if seed:
+            await seed_default_data()
+        async with AsyncSessionLocal() as session:
+            geocoded = await geocode_missing_jobs(session)
+        if geocoded:
+            logger.info("Geocoded %d jobs", geocoded)
+
+
+def _filters(**values) -> JobFilters:
+    # The Query() defaults only apply when FastAPI builds the filters.
+    defaults = {
+        "q": None,
+        "title": None,
+        "location": None,
+        "sector": None,
+        "work_type": None,
+        "min_salary": None,
+        "max_salary": None,
+        "near": None,
+        "radius_km": settings.GEO_RADIUS_DEFAULT_KM,
+        "include_remote": True,
+    }
+    return JobFilters(**{**defaults, **values})
+
+
+def warmup_statements(primary: bool) -> list:
+    """The statements the hot handlers send, built by the same code.
+
+    asyncpg keys prepared statements by SQL text, so these must match the
+    handlers exactly. The redirect upsert is a write and only runs on the
+    primary, where it matches no job and is rolled back.
+    """
+    page_size = settings.JOBS_PAGE_SIZE_DEFAULT
+    next_page = encode_cursor(datetime.utcnow(), SAMPLE_ID)
+    filtered = _filters(sector=JobSectorEnum.ESG, work_type=WorkTypeEnum.REMOTE)
+    statements = [
+        _jobs_query(_filters(), "full", None, None, page_size)[0],
+        _jobs_query(_filters(), "summary", None, None, page_size)[0],
+        _jobs_query(_filters(), "summary", None, next_page, page_size)[0],
+        _jobs_query(filtered, "summary", None, None, page_size)[0],
+        facet_query(_filters()),
+        _job_detail_query(SAMPLE_ID),
+        _company_query(SAMPLE_ID),
+        _employer_jobs_query(SAMPLE_ID),
+    ]
+    if primary:
+        statements.append(record_clicks_statement({SAMPLE_ID: 1}))
+    return statements
+
+
+async def _warm_engine(target: AsyncEngine, connections: int, primary: bool) -> None:
+    statements = [] if settings.DB_EXTERNAL_POOLER else warmup_statements(primary)
+
+    async def _open() -> None:
+        async with target.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+            # An ORM session, so loader options and deferred columns compile as in the handlers.
+            async with AsyncSession(bind=conn) as session:
+                for stmt in statements:
+                    await session.execute(stmt)
+                await session.rollback()
+
+    # Held concurrently so each task gets its own pooled connection.
+    await asyncio.gather(*(_open() for _ in range(connections)))
+
+
+async def warm_up() -> None:
+    connections = max(min(settings.DB_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE), 1)
+    await _warm_engine(engine, connections, primary=True)
+    for replica in read_router.replicas:
+        try:
+            await _warm_engine(replica.engine, connections, primary=False)
+        except Exception:
+            read_router.mark_down(replica)
+
+
+async def _main(seed: bool) -> None:
+    try:
+        started = time.perf_counter()
+        await bootstrap(seed=seed)
+        print(f"Bootstrap finished in {time.perf_counter() - started:.1f}s")
+    finally:
+        await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.bootstrap")
+    parser.add_argument("--skip-seed", action="store_true", help="only create the schema and run migrations")
+    args = parser.parse_args()
+    asyncio.run(_main(seed=not args.skip_seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,133 @@
 from pathlib import Path
 from pydantic import BaseSettings, Field, validator
 
+from .startup import startup_report
+
 
 class Settings(BaseSettings):
     APP_NAME: str = "Green Jobs API"
     API_PREFIX: str = "/api"
+    SERVER_PROFILE: str = Field(default="dev", env="SERVER_PROFILE", regex="^(dev|production)$")
+    SERVER_HOST: str = Field(default="0.0.0.0", env="SERVER_HOST")
+    SERVER_PORT: int = Field(default=8000, env="SERVER_PORT")
+    # 0 sizes the worker pool to the CPUs available to the process.
+    SERVER_WORKERS: int = Field(default=0, env="SERVER_WORKERS")
+    SERVER_MAX_REQUESTS: int = Field(default=10000, env="SERVER_MAX_REQUESTS")
+    SERVER_MAX_REQUESTS_JITTER: int = Field(default=1000, env="SERVER_MAX_REQUESTS_JITTER")
+    SERVER_KEEPALIVE_SECONDS: int = Field(default=5, env="SERVER_KEEPALIVE_SECONDS")
+    SERVER_BACKLOG: int = Field(default=2048, env="SERVER_BACKLOG")
+    SERVER_GRACEFUL_TIMEOUT: int = Field(default=30, env="SERVER_GRACEFUL_TIMEOUT")
+    SERVER_WORKER_TIMEOUT: int = Field(default=60, env="SERVER_WORKER_TIMEOUT")
     DATABASE_URL: str = Field(
         default="postgresql+asyncpg://postgres:postgres@db:5432/greenjobs",
         env="DATABASE_URL",
     )
+    DATABASE_READ_URLS: list[str] = Field(default_factory=list, env="DATABASE_READ_URLS")
+    DB_REPLICA_MAX_LAG_SECONDS: float = Field(default=5.0, env="DB_REPLICA_MAX_LAG_SECONDS")
+    DB_REPLICA_HEALTH_INTERVAL_SECONDS: float = Field(default=5.0, env="DB_REPLICA_HEALTH_INTERVAL_SECONDS")
+    # Each worker process gets its own pool: the database must allow
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    DB_POOL_SIZE: int = Field(default=10, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=5, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(default=10.0, env="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100, env="DB_STATEMENT_CACHE_SIZE")
+    DB_BOOTSTRAP_ON_STARTUP: bool = Field(default=False, env="DB_BOOTSTRAP_ON_STARTUP")
+    DB_WARMUP_CONNECTIONS: int = Field(default=4, env="DB_WARMUP_CONNECTIONS")
+    # Set when connecting through a transaction-pooling proxy such as
+    # PgBouncer: server-side prepared statements cannot be reused there.
+    DB_EXTERNAL_POOLER: bool = Field(default=False, env="DB_EXTERNAL_POOLER")
     JWT_SECRET: str = Field(default="change-me-secret", env="JWT_SECRET")
     JWT_ALGORITHM: str = Field(default="HS256", env="JWT_ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=60, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    USER_CACHE_TTL_SECONDS: int = Field(default=60, env="USER_CACHE_TTL_SECONDS")
+    USER_CACHE_MAX_ENTRIES: int = Field(default=10000, env="USER_CACHE_MAX_ENTRIES")
+    BCRYPT_ROUNDS: int = Field(default=12, env="BCRYPT_ROUNDS")
+    PASSWORD_HASH_WORKERS: int = Field(default=2, env="PASSWORD_HASH_WORKERS")
+    PASSWORD_HASH_MAX_PENDING: int = Field(default=64, env="PASSWORD_HASH_MAX_PENDING")
     CORS_ORIGINS: list[str] = Field(default_factory=lambda: ["http://localhost:5173"])
     ADMIN_NAME: str = Field(default="Platform Admin", env="ADMIN_NAME")
     ADMIN_EMAIL: str = Field(default="admin@greenjobs.example.com", env="ADMIN_EMAIL")
     ADMIN_PASSWORD: str = Field(default="password123", env="ADMIN_PASSWORD")
+    JOBS_PAGE_SIZE_DEFAULT: int = Field(default=50, env="JOBS_PAGE_SIZE_DEFAULT")
+    JOBS_PAGE_SIZE_MAX: int = Field(default=200, env="JOBS_PAGE_SIZE_MAX")
+    ADMIN_STATS_CACHE_TTL_SECONDS: int = Field(default=30, env="ADMIN_STATS_CACHE_TTL_SECONDS")
+    RESPONSE_CACHE_BACKEND: str = Field(default="memory", env="RESPONSE_CACHE_BACKEND")
+    RESPONSE_CACHE_URL: str | None = Field(default=None, env="RESPONSE_CACHE_URL")
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=2048, env="RESPONSE_CACHE_MAX_ENTRIES")
+    RESPONSE_CACHE_TTL_JOBS: int = Field(default=30, env="RESPONSE_CACHE_TTL_JOBS")
+    RESPONSE_CACHE_TTL_FEATURED: int = Field(default=60, env="RESPONSE_CACHE_TTL_FEATURED")
+    RESPONSE_CACHE_TTL_JOB: int = Field(default=120, env="RESPONSE_CACHE_TTL_JOB")
+    RESPONSE_CACHE_TTL_COMPANY: int = Field(default=300, env="RESPONSE_CACHE_TTL_COMPANY")
+    COMPRESSION_ENABLED: bool = Field(default=True, env="COMPRESSION_ENABLED")
+    COMPRESSION_MIN_SIZE: int = Field(default=1024, env="COMPRESSION_MIN_SIZE")
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, env="COMPRESSION_GZIP_LEVEL")
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=5, env="COMPRESSION_BROTLI_QUALITY")
+    # Cached payloads are compressed once per fill, so they can afford more effort.
+    COMPRESSION_CACHED_BROTLI_QUALITY: int = Field(default=9, env="COMPRESSION_CACHED_BROTLI_QUALITY")
+    RESPONSE_CACHE_TTL_FACETS: int = Field(default=60, env="RESPONSE_CACHE_TTL_FACETS")
+    FACET_LOCATION_LIMIT: int = Field(default=20, env="FACET_LOCATION_LIMIT")
+    FACET_SALARY_BOUNDARIES: list[float] = Field(
+        default=[0, 25000, 50000, 75000, 100000, 150000, 200000], env="FACET_SALARY_BOUNDARIES"
+    )
+    EXPORT_BATCH_ROWS: int = Field(default=1000, env="EXPORT_BATCH_ROWS")
+    INGEST_CHUNK_SIZE: int = Field(default=1000, env="INGEST_CHUNK_SIZE")
+    # A quoted CSV field spanning more than this is treated as an unterminated quote.
+    INGEST_MAX_RECORD_BYTES: int = Field(default=1_048_576, env="INGEST_MAX_RECORD_BYTES")
+    INGEST_MAX_REPORTED_ERRORS: int = Field(default=1000, env="INGEST_MAX_REPORTED_ERRORS")
+    ADMISSION_ENABLED: bool = Field(default=True, env="ADMISSION_ENABLED")
+    ADMISSION_QUEUE_TIMEOUT_MS: int = Field(default=500, env="ADMISSION_QUEUE_TIMEOUT_MS")
+    ADMISSION_RETRY_AFTER_SECONDS: int = Field(default=1, env="ADMISSION_RETRY_AFTER_SECONDS")
+    ADMISSION_AUTH_CONCURRENCY: int = Field(default=8, env="ADMISSION_AUTH_CONCURRENCY")
+    ADMISSION_AUTH_QUEUE: int = Field(default=32, env="ADMISSION_AUTH_QUEUE")
+    ADMISSION_SEARCH_CONCURRENCY: int = Field(default=12, env="ADMISSION_SEARCH_CONCURRENCY")
+    ADMISSION_SEARCH_QUEUE: int = Field(default=48, env="ADMISSION_SEARCH_QUEUE")
+    ADMISSION_ADMIN_CONCURRENCY: int = Field(default=4, env="ADMISSION_ADMIN_CONCURRENCY")
+    ADMISSION_ADMIN_QUEUE: int = Field(default=8, env="ADMISSION_ADMIN_QUEUE")
+    ADMISSION_BULK_CONCURRENCY: int = Field(default=2, env="ADMISSION_BULK_CONCURRENCY")
+    ADMISSION_BULK_QUEUE: int = Field(default=2, env="ADMISSION_BULK_QUEUE")
+    ADMISSION_DEFAULT_CONCURRENCY: int = Field(default=64, env="ADMISSION_DEFAULT_CONCURRENCY")
+    ADMISSION_DEFAULT_QUEUE: int = Field(default=128, env="ADMISSION_DEFAULT_QUEUE")
+    FEATURED_LIMIT: int = Field(default=4, env="FEATURED_LIMIT")
+    FEATURED_REFRESH_SECONDS: int = Field(default=300, env="FEATURED_REFRESH_SECONDS")
+    FEATURED_RECENCY_HALF_LIFE_HOURS: float = Field(default=72.0, env="FEATURED_RECENCY_HALF_LIFE_HOURS")
+    FEATURED_WEIGHT_RECENCY: float = Field(default=1.0, env="FEATURED_WEIGHT_RECENCY")
+    FEATURED_WEIGHT_VERIFIED: float = Field(default=0.5, env="FEATURED_WEIGHT_VERIFIED")
+    FEATURED_WEIGHT_CLICKS: float = Field(default=1.0, env="FEATURED_WEIGHT_CLICKS")
+    MATCH_INDEX_REFRESH_SECONDS: int = Field(default=600, env="MATCH_INDEX_REFRESH_SECONDS")
+    MATCH_RESULTS_MAX: int = Field(default=50, env="MATCH_RESULTS_MAX")
+    GEO_RADIUS_DEFAULT_KM: float = Field(default=50, env="GEO_RADIUS_DEFAULT_KM")
+    GEO_RADIUS_MAX_KM: float = Field(default=20000, env="GEO_RADIUS_MAX_KM")
+    METRICS_ENABLED: bool = Field(default=True, env="METRICS_ENABLED")
+    METRICS_SAMPLE_RATE: float = Field(default=1.0, env="METRICS_SAMPLE_RATE")
+    METRICS_SLOW_QUERY_MS: float = Field(default=200.0, env="METRICS_SLOW_QUERY_MS")
+    METRICS_SLOW_QUERY_LOG_SIZE: int = Field(default=50, env="METRICS_SLOW_QUERY_LOG_SIZE")
+    METRICS_SERVER_TIMING: bool = Field(default=False, env="METRICS_SERVER_TIMING")
+    REDIRECT_BUFFER_ENABLED: bool = Field(default=False, env="REDIRECT_BUFFER_ENABLED")
+    REDIRECT_BUFFER_FLUSH_MS: int = Field(default=1000, env="REDIRECT_BUFFER_FLUSH_MS")
+    REDIRECT_BUFFER_MAX_EVENTS: int = Field(default=500, env="REDIRECT_BUFFER_MAX_EVENTS")
+    # Clicks kept for retry while the database is unreachable; older batches beyond this are dropped.
+    REDIRECT_BUFFER_MAX_PENDING: int = Field(default=100_000, env="REDIRECT_BUFFER_MAX_PENDING")
 
     class Config:
         env_file = str(Path(__file__).resolve().parents[2] / ".env")
         env_file_encoding = "utf-8"
 
-    @validator("CORS_ORIGINS", pre=True)
+        @classmethod
+        def parse_env_var(cls, field_name: str, raw_val: str):
+            # Allow comma-separated lists as well as JSON arrays.
+            list_fields = ("CORS_ORIGINS", "DATABASE_READ_URLS", "FACET_SALARY_BOUNDARIES")
+            if field_name in list_fields and not raw_val.lstrip().startswith("["):
+                return raw_val
+            return cls.json_loads(raw_val)
+
+    @validator("CORS_ORIGINS", "DATABASE_READ_URLS", "FACET_SALARY_BOUNDARIES", pre=True)
     def assemble_origins(cls, value):
         if isinstance(value, str):
             return [origin.strip() for origin in value.split(",") if origin.strip()]
         return value
 
 
-settings = Settings()
+with startup_report.phase("config"):
+    settings = Settings()
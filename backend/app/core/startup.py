@@ -0,0 +1,47 @@
+"""Wall-clock breakdown of worker startup: imports, settings, DB warm-up."""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+def _process_started() -> float:
+    """perf_counter() reading at process start where /proc exposes it, else now."""
+    try:
+        with open("/proc/self/stat") as handle:
+            fields = handle.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as handle:
+            uptime = float(handle.read().split()[0])
+        age = uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.perf_counter() - max(age, 0.0)
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter()
+
+
+class StartupReport:
+    def __init__(self):
+        self.started = _process_started()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def mark_imported(self) -> None:
+        # Everything up to here that is not already attributed to a phase.
+        elapsed = time.perf_counter() - self.started
+        self.phases["import"] = elapsed - sum(self.phases.values())
+
+    def as_dict(self) -> dict:
+        phases = {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()}
+        return {"phasesMs": phases, "totalMs": round(sum(phases.values()), 1)}
+
+    def summary(self) -> str:
+        return ", ".join(f"{name}={ms}ms" for name, ms in self.as_dict()["phasesMs"].items())
+
+
+startup_report = StartupReport()
@@ -1,15 +1,233 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from contextlib import asynccontextmanager
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, future=True, echo=False)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolMetrics:
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    invalidations: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - started)
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def _engine_options() -> dict:
+    connect_args: dict = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if settings.DB_EXTERNAL_POOLER:
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=_unique_statement_name,
+        )
+    return {
+        "future": True,
+        "echo": False,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options())
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
 
-@asynccontextmanager
-async def get_session() -> AsyncSession:
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    pool_metrics.connects += 1
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_metrics.checkouts += 1
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    pool_metrics.checkins += 1
+
+
+@event.listens_for(engine.sync_engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    pool_metrics.invalidations += 1
+
+
+def pool_status() -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checkedOut": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "idle": pool.checkedin(),
+        "connects": pool_metrics.connects,
+        "checkouts": pool_metrics.checkouts,
+        "checkins": pool_metrics.checkins,
+        "invalidations": pool_metrics.invalidations,
+        "timeouts": pool_metrics.timeouts,
+        "waitSecondsTotal": round(pool_metrics.wait_seconds_total, 6),
+        "waitSecondsMax": round(pool_metrics.wait_seconds_max, 6),
+        "replicas": [
+            {
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "lagSeconds": replica.lag_seconds,
+            }
+            for replica in read_router.replicas
+        ],
+    }
+
+
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReadReplica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine: AsyncEngine = create_async_engine(url, **_engine_options())
+        self.sessionmaker = async_sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = True
+        self.lag_seconds = 0.0
+
+
+class ReadReplicaRouter:
+    """Round-robins read sessions over healthy replicas, else the primary.
+
+    A background task polls each replica's replay lag; replicas that are
+    unreachable or lag more than ``DB_REPLICA_MAX_LAG_SECONDS`` are skipped
+    until a later check finds them healthy again.
+    """
+
+    def __init__(self, urls: list[str]):
+        self.replicas = [ReadReplica(url) for url in urls]
+        self._next = 0
+        self._task: asyncio.Task | None = None
+
+    def pick(self) -> ReadReplica | None:
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if replica.healthy:
+                return replica
+        return None
+
+    def mark_down(self, replica: ReadReplica) -> None:
+        if replica.healthy:
+            logger.warning("Read replica %s marked unhealthy", replica.engine.url.render_as_string(hide_password=True))
+        replica.healthy = False
+
+    async def check(self, replica: ReadReplica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await asyncio.wait_for(conn.scalar(REPLICA_LAG_SQL), timeout=settings.DB_POOL_TIMEOUT)
+        except Exception:
+            self.mark_down(replica)
+            return
+        replica.lag_seconds = float(lag or 0)
+        replica.healthy = replica.lag_seconds <= settings.DB_REPLICA_MAX_LAG_SECONDS
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+            await asyncio.sleep(settings.DB_REPLICA_HEALTH_INTERVAL_SECONDS)
+
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+read_router = ReadReplicaRouter(settings.DATABASE_READ_URLS)
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+def read_sessionmaker() -> async_sessionmaker:
+    """Session factory for reads that outlive a request, such as streamed exports."""
+    replica = read_router.pick()
+    return replica.sessionmaker if replica is not None else AsyncSessionLocal
+
+
+async def get_read_session() -> AsyncIterator[AsyncSession]:
+    """Session for read-only handlers; routed to a replica when one is healthy."""
+    replica = read_router.pick()
+    if replica is None:
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+    async with replica.sessionmaker() as session:
+        try:
+            yield session
+        except DBAPIError as exc:
+            if exc.connection_invalidated:
+                read_router.mark_down(replica)
+            raise
+        except OSError:
+            read_router.mark_down(replica)
+            raise
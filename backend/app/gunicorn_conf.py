@@ -0,0 +1,24 @@
+"""Gunicorn settings for the production profile, derived from ``Settings``."""
+from uvicorn.workers import UvicornWorker
+
+from app.core.config import settings
+from app.serve import worker_count
+
+
+class ProductionWorker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+
+bind = f"{settings.SERVER_HOST}:{settings.SERVER_PORT}"
+workers = worker_count()
+worker_class = "app.gunicorn_conf.ProductionWorker"
+# Recycle workers to contain slow memory growth; the jitter keeps them from
+# restarting in lockstep.
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+timeout = settings.SERVER_WORKER_TIMEOUT
+# UvicornWorker uses this as uvicorn's timeout_keep_alive.
+keepalive = settings.SERVER_KEEPALIVE_SECONDS
+backlog = settings.SERVER_BACKLOG
+accesslog = "-"
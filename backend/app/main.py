@@ -1,20 +1,46 @@
-from fastapi import FastAPI
+import logging
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from .bootstrap import bootstrap, warm_up
 from .core.config import settings
+from .core.security import password_hasher
+from .core.startup import startup_report
+from .database import pool_status, read_router
 from .routers import admin, auth, jobs
-from .services.seed_data import init_db, seed_default_data
+from .services.admission import AdmissionMiddleware, admission_controller
+from .services.compression import CompressionMiddleware
+from .services.featured import featured_ranking
+from .services.matching import job_matcher
+from .services.metrics import MetricsMiddleware, install_query_hooks, metrics_registry
+from .services.redirects import redirect_buffer
+from .services.serialization import dumps
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title=settings.APP_NAME)
 
+# Inside CORS so rejections still carry CORS headers the browser can read.
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[jobs.NEXT_CURSOR_HEADER, "Server-Timing"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+if settings.METRICS_ENABLED:
+    install_query_hooks()
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth.router, prefix=f"{settings.API_PREFIX}/auth", tags=["auth"])
 app.include_router(jobs.router, prefix=settings.API_PREFIX, tags=["jobs"])
 app.include_router(admin.router, prefix=settings.API_PREFIX, tags=["admin"])
@@ -22,10 +48,49 @@ app.include_router(admin.router, prefix=settings.API_PREFIX, tags=["admin"])
 
 @app.on_event("startup")
 async def on_startup():
-    await init_db()
-    await seed_default_data()
+    if settings.DB_BOOTSTRAP_ON_STARTUP:
+        with startup_report.phase("bootstrap"):
+            await bootstrap()
+    with startup_report.phase("warmup"):
+        await warm_up()
+    await redirect_buffer.start()
+    await read_router.start()
+    await featured_ranking.start()
+    await job_matcher.start()
+    logger.info("Worker started: %s", startup_report.summary())
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await job_matcher.stop()
+    await featured_ranking.stop()
+    await redirect_buffer.stop()
+    await read_router.stop()
+    password_hasher.shutdown()
 
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/health/db")
+async def database_pool_status():
+    return pool_status()
+
+
+@app.get("/metrics")
+async def metrics():
+    payload = metrics_registry.snapshot()
+    payload["startup"] = startup_report.as_dict()
+    payload["pool"] = pool_status()
+    payload["admission"] = admission_controller.snapshot()
+    payload["passwordHasher"] = {
+        "pending": password_hasher.pending,
+        "queueDepth": password_hasher.queue_depth,
+        "maxPending": password_hasher.max_pending,
+    }
+    return Response(content=dumps(payload), media_type="application/json")
+
+
+startup_report.mark_imported()
@@ -0,0 +1,142 @@
+"""Versioned, idempotent schema migrations.
+
+Every migration runs statement by statement on an autocommit connection so
+that indexes can be built with ``CREATE INDEX CONCURRENTLY`` against a live
+database. Statements must therefore be safe to re-run: a deploy that dies
+half-way through a migration simply applies it again.
+"""
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Union
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..database import engine
+
+REQUIRED_EXTENSIONS = ["pg_trgm"]
+# Key for the session-level advisory lock that serialises schema changes
+# across concurrently deploying instances.
+MIGRATION_LOCK_KEY = 7_213_001
+
+
+@dataclass(frozen=True)
+class ConcurrentIndex:
+    name: str
+    definition: str
+    unique: bool = False
+
+
+Operation = Union[str, ConcurrentIndex]
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    description: str
+    operations: list[Operation] = field(default_factory=list)
+
+
+from . import (  # noqa: E402
+    v0001_job_search,
+    v0002_hot_path_indexes,
+    v0003_redirect_stats_unique,
+    v0004_redirect_click_rollups,
+    v0005_job_external_id,
+    v0006_job_salary_indexes,
+    v0007_job_geo,
+    v0008_keyset_not_null,
+)
+
+MIGRATIONS: list[Migration] = [
+    v0001_job_search.migration,
+    v0002_hot_path_indexes.migration,
+    v0003_redirect_stats_unique.migration,
+    v0004_redirect_click_rollups.migration,
+    v0005_job_external_id.migration,
+    v0006_job_salary_indexes.migration,
+    v0007_job_geo.migration,
+    v0008_keyset_not_null.migration,
+]
+
+
+@asynccontextmanager
+async def migration_lock() -> AsyncIterator[None]:
+    """Hold the schema advisory lock; other callers block until it is released."""
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            yield
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+async def ensure_extensions(conn: AsyncConnection) -> None:
+    for extension in REQUIRED_EXTENSIONS:
+        await conn.exec_driver_sql(f"CREATE EXTENSION IF NOT EXISTS {extension}")
+
+
+async def _ensure_version_table(conn: AsyncConnection) -> None:
+    await conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version text PRIMARY KEY,
+            description text NOT NULL,
+            applied_at timestamp NOT NULL DEFAULT now()
+        )
+        """
+    )
+
+
+async def applied_versions(conn: AsyncConnection) -> set[str]:
+    await _ensure_version_table(conn)
+    result = await conn.execute(text("SELECT version FROM schema_migrations"))
+    return set(result.scalars().all())
+
+
+async def _create_index_concurrently(conn: AsyncConnection, index: ConcurrentIndex) -> None:
+    # A failed CONCURRENTLY build leaves an INVALID index behind that
+    # IF NOT EXISTS would happily skip, so drop it before retrying.
+    valid = await conn.scalar(
+        text(
+            "SELECT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+        ),
+        {"name": index.name},
+    )
+    if valid is False:
+        await conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}")
+    unique = "UNIQUE " if index.unique else ""
+    await conn.exec_driver_sql(
+        f"CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {index.name} ON {index.definition}"
+    )
+
+
+async def _apply(conn: AsyncConnection, migration: Migration) -> None:
+    for operation in migration.operations:
+        if isinstance(operation, ConcurrentIndex):
+            await _create_index_concurrently(conn, operation)
+        else:
+            await conn.exec_driver_sql(operation)
+    await conn.execute(
+        text(
+            "INSERT INTO schema_migrations (version, description) VALUES (:version, :description) "
+            "ON CONFLICT (version) DO NOTHING"
+        ),
+        {"version": migration.version, "description": migration.description},
+    )
+
+
+async def pending_migrations(conn: AsyncConnection) -> list[Migration]:
+    applied = await applied_versions(conn)
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+
+async def run_migrations() -> list[str]:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        pending = await pending_migrations(conn)
+        for migration in pending:
+            await _apply(conn, migration)
+    return [migration.version for migration in pending]
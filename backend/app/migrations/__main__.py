@@ -0,0 +1,57 @@
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..database import engine
+from . import migration_lock, pending_migrations, run_migrations
+from .plans import check_query_plans
+
+
+async def _status() -> int:
+    async with engine.connect() as conn:  # type: AsyncConnection
+        pending = await pending_migrations(conn)
+        await conn.commit()
+    if not pending:
+        print("Schema is up to date")
+    for migration in pending:
+        print(f"pending {migration.version}: {migration.description}")
+    return 0
+
+
+async def _upgrade() -> int:
+    async with migration_lock():
+        applied = await run_migrations()
+    print(f"Applied {', '.join(applied)}" if applied else "Nothing to apply")
+    return 0
+
+
+async def _check_plans() -> int:
+    failures = await check_query_plans()
+    for name, tables in failures.items():
+        print(f"{name}: seq scan on {', '.join(tables)}")
+    if not failures:
+        print("All router queries are index-backed")
+    return 1 if failures else 0
+
+
+COMMANDS = {"status": _status, "upgrade": _upgrade, "check-plans": _check_plans}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.migrations")
+    parser.add_argument("command", choices=sorted(COMMANDS), nargs="?", default="upgrade")
+    args = parser.parse_args()
+
+    async def _run() -> int:
+        try:
+            return await COMMANDS[args.command]()
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""EXPLAIN the hot router queries and report any that fall back to a seq scan.
+
+Sequential scans are disabled for the check so that tiny development tables
+do not mask a missing index: if the planner still picks a ``Seq Scan`` there
+is no index that can serve the query.
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from ..database import engine
+from ..models import Company, Job, JobSectorEnum, WorkTypeEnum
+from ..routers.jobs import _summary_select
+from ..services.job_filters import JobFilters
+from ..services.redirects import record_clicks_statement
+from ..services.search import search_query
+
+SAMPLE_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def router_queries() -> dict:
+    ts_query = search_query("solar")
+    return {
+        "list_jobs": select(Job).order_by(Job.posted_date.desc(), Job.id.desc()).limit(51),
+        "list_jobs_summary": _summary_select().order_by(Job.posted_date.desc(), Job.id.desc()).limit(51),
+        "list_jobs_filtered": select(Job)
+        .where(Job.sector == JobSectorEnum.ESG, Job.work_type == WorkTypeEnum.REMOTE)
+        .order_by(Job.posted_date.desc(), Job.id.desc())
+        .limit(51),
+        "list_jobs_search": select(Job).where(Job.search_vector.op("@@")(ts_query)).limit(51),
+        "list_jobs_title": select(Job).where(Job.title.ilike("%analyst%")).limit(51),
+        "list_jobs_location": select(Job).where(Job.location.op("%>")("portland")).limit(51),
+        "list_jobs_salary_sort": select(Job).order_by(Job.salary_max.desc(), Job.id.desc()).limit(51),
+        "list_jobs_salary_range": JobFilters(
+            q=None,
+            title=None,
+            location=None,
+            sector=None,
+            work_type=None,
+            min_salary=60000,
+            max_salary=90000,
+            near=None,
+            radius_km=50,
+            include_remote=False,
+        )
+        .apply(select(Job))
+        .limit(51),
+        "list_jobs_near": JobFilters(
+            q=None,
+            title=None,
+            location=None,
+            sector=None,
+            work_type=None,
+            min_salary=None,
+            max_salary=None,
+            near="Portland, OR",
+            radius_km=50,
+            include_remote=False,
+        )
+        .apply(select(Job))
+        .limit(51),
+        "featured_jobs": select(Job).options(selectinload(Job.company)).order_by(Job.posted_date.desc()).limit(4),
+        "get_job": select(Job).where(Job.id == SAMPLE_ID),
+        "get_company": select(Company).where(Company.id == SAMPLE_ID),
+        "employer_jobs": select(Job).where(Job.company_id == SAMPLE_ID).order_by(Job.posted_date.desc()),
+        "track_redirect": record_clicks_statement({SAMPLE_ID: 1}),
+        "pending_companies": select(Company).where(Company.is_verified.is_(False)),
+    }
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def check_query_plans() -> dict[str, list[str]]:
+    failures: dict[str, list[str]] = {}
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        for name, stmt in router_queries().items():
+            compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+            plan = result.scalar()[0]["Plan"]
+            scans = _seq_scans(plan)
+            if scans:
+                failures[name] = scans
+        await conn.rollback()
+    return failures
@@ -0,0 +1,67 @@
+"""Full-text search vector, its triggers and the trigram indexes on jobs."""
+from ..services.search import SEARCH_CONFIG
+from . import ConcurrentIndex, Migration
+
+migration = Migration(
+    version="0001",
+    description="job search vector and trigram indexes",
+    operations=[
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        f"""
+        CREATE OR REPLACE FUNCTION job_search_vector(
+            title text, description text, qualifications jsonb, company_name text
+        ) RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(company_name, '')), 'B')
+                || setweight(jsonb_to_tsvector('{SEARCH_CONFIG}', coalesce(qualifications, '[]'::jsonb), '["string"]'), 'C')
+                || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'D')
+        $$
+        """,
+        """
+        CREATE OR REPLACE FUNCTION jobs_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := job_search_vector(
+                NEW.title,
+                NEW.description,
+                NEW.qualifications,
+                (SELECT name FROM companies WHERE id = NEW.company_id)
+            );
+            RETURN NEW;
+        END
+        $$
+        """,
+        "DROP TRIGGER IF EXISTS jobs_search_vector_update ON jobs",
+        """
+        CREATE TRIGGER jobs_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, description, qualifications, company_id ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_trigger()
+        """,
+        """
+        CREATE OR REPLACE FUNCTION companies_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE jobs
+            SET search_vector = job_search_vector(title, description, qualifications, NEW.name)
+            WHERE company_id = NEW.id;
+            RETURN NULL;
+        END
+        $$
+        """,
+        "DROP TRIGGER IF EXISTS companies_search_vector_update ON companies",
+        """
+        CREATE TRIGGER companies_search_vector_update
+        AFTER UPDATE OF name ON companies
+        FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION companies_search_vector_trigger()
+        """,
+        # Backfill rows that predate the column (e.g. the seeded catalog).
+        """
+        UPDATE jobs
+        SET search_vector = job_search_vector(jobs.title, jobs.description, jobs.qualifications, companies.name)
+        FROM companies
+        WHERE companies.id = jobs.company_id AND jobs.search_vector IS NULL
+        """,
+        ConcurrentIndex("ix_jobs_search_vector", "jobs USING gin (search_vector)"),
+        ConcurrentIndex("ix_jobs_title_trgm", "jobs USING gin (title gin_trgm_ops)"),
+        ConcurrentIndex("ix_jobs_location_trgm", "jobs USING gin (location gin_trgm_ops)"),
+    ],
+)
@@ -0,0 +1,17 @@
+"""B-tree and partial indexes for the list, dashboard and tracking lookups."""
+from . import ConcurrentIndex, Migration
+
+migration = Migration(
+    version="0002",
+    description="hot path indexes",
+    operations=[
+        ConcurrentIndex("ix_jobs_posted_date_id", "jobs (posted_date, id)"),
+        ConcurrentIndex("ix_jobs_company_id_posted_date", "jobs (company_id, posted_date)"),
+        ConcurrentIndex(
+            "ix_jobs_sector_work_type_posted_date",
+            "jobs (sector, work_type, posted_date, id)",
+        ),
+        ConcurrentIndex("ix_redirect_stats_job_id", "redirect_stats (job_id)"),
+        ConcurrentIndex("ix_companies_pending", "companies (created_at) WHERE is_verified IS false"),
+    ],
+)
@@ -0,0 +1,30 @@
+"""One redirect_stats row per job so clicks can be upserted atomically."""
+from . import ConcurrentIndex, Migration
+
+migration = Migration(
+    version="0003",
+    description="unique redirect_stats.job_id",
+    operations=[
+        # Fold duplicate rows left by the old read-modify-write path into the
+        # oldest row per job. Single statement, so a retry cannot double count.
+        """
+        WITH removed AS (
+            DELETE FROM redirect_stats AS r
+            USING (
+                SELECT job_id, min(id) AS keep_id
+                FROM redirect_stats
+                GROUP BY job_id
+                HAVING count(*) > 1
+            ) AS k
+            WHERE r.job_id = k.job_id AND r.id <> k.keep_id
+            RETURNING k.keep_id, r.clicks
+        )
+        UPDATE redirect_stats AS s
+        SET clicks = coalesce(s.clicks, 0) + merged.clicks
+        FROM (SELECT keep_id, sum(coalesce(clicks, 0)) AS clicks FROM removed GROUP BY keep_id) AS merged
+        WHERE s.id = merged.keep_id
+        """,
+        ConcurrentIndex("ux_redirect_stats_job_id", "redirect_stats (job_id)", unique=True),
+        "DROP INDEX CONCURRENTLY IF EXISTS ix_redirect_stats_job_id",
+    ],
+)
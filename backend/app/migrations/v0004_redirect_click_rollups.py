@@ -0,0 +1,18 @@
+"""Hourly per-job click rollups fed by the redirect tracking path."""
+from . import ConcurrentIndex, Migration
+
+migration = Migration(
+    version="0004",
+    description="hourly redirect click rollups",
+    operations=[
+        """
+        CREATE TABLE IF NOT EXISTS redirect_click_hourly (
+            job_id varchar NOT NULL REFERENCES jobs (id),
+            bucket_start timestamp without time zone NOT NULL,
+            clicks integer NOT NULL DEFAULT 0,
+            PRIMARY KEY (job_id, bucket_start)
+        )
+        """,
+        ConcurrentIndex("ix_redirect_click_hourly_bucket_start", "redirect_click_hourly (bucket_start)"),
+    ],
+)
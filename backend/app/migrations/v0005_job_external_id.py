@@ -0,0 +1,15 @@
+"""External ids so feed imports can upsert jobs they have seen before."""
+from . import ConcurrentIndex, Migration
+
+migration = Migration(
+    version="0005",
+    description="job external ids",
+    operations=[
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS external_id varchar",
+        ConcurrentIndex(
+            "ux_jobs_company_external_id",
+            "jobs (company_id, external_id) WHERE external_id IS NOT NULL",
+            unique=True,
+        ),
+    ],
+)
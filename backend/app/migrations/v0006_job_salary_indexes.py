@@ -0,0 +1,12 @@
+"""Indexes for salary overlap filters and salary-ordered listings."""
+from ..models import SALARY_RANGE_SQL
+from . import ConcurrentIndex, Migration
+
+migration = Migration(
+    version="0006",
+    description="job salary indexes",
+    operations=[
+        ConcurrentIndex("ix_jobs_salary_max_id", "jobs (salary_max, id)"),
+        ConcurrentIndex("ix_jobs_salary_range", f"jobs USING gist (({SALARY_RANGE_SQL}))"),
+    ],
+)
@@ -0,0 +1,13 @@
+"""Geocoded job coordinates and the geohash index used by radius search."""
+from . import ConcurrentIndex, Migration
+
+migration = Migration(
+    version="0007",
+    description="job geo columns",
+    operations=[
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS latitude double precision",
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS longitude double precision",
+        'ALTER TABLE jobs ADD COLUMN IF NOT EXISTS geohash varchar(12) COLLATE "C"',
+        ConcurrentIndex("ix_jobs_geohash", "jobs (geohash) WHERE geohash IS NOT NULL"),
+    ],
+)
@@ -0,0 +1,20 @@
+"""Make keyset pagination keys NOT NULL.
+
+A row-value comparison against NULL is never true, so rows with a NULL key
+were skipped by cursor pages and a page ending on one produced a cursor that
+could not be parsed.
+"""
+from . import Migration
+
+migration = Migration(
+    version="0008",
+    description="keyset keys not null",
+    operations=[
+        "UPDATE jobs SET posted_date = timezone('UTC', now()) WHERE posted_date IS NULL",
+        "ALTER TABLE jobs ALTER COLUMN posted_date SET NOT NULL",
+        "UPDATE companies SET created_at = timezone('UTC', now()) WHERE created_at IS NULL",
+        "ALTER TABLE companies ALTER COLUMN created_at SET NOT NULL",
+        "UPDATE redirect_stats SET clicks = 0 WHERE clicks IS NULL",
+        "ALTER TABLE redirect_stats ALTER COLUMN clicks SET NOT NULL",
+    ],
+)
@@ -12,9 +12,11 @@ from sqlalchemy import (
     Float,
     Text,
     Integer,
+    Index,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from ..database import Base
 
@@ -48,9 +50,21 @@ class Company(Base):
     description = Column(Text, default='')
     website = Column(String, default='')
     is_verified = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Keyset pagination key (admin pending list), so never null; see migration 0008.
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     jobs = relationship('Job', back_populates='company', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        Index('ix_companies_pending', 'created_at', postgresql_where=text('is_verified IS false')),
+    )
+
+
+# Salary band as a closed numeric range; backs the GiST index used by the
+# salary overlap filter, so queries must use this exact expression.
+SALARY_RANGE_SQL = (
+    "numrange(least(salary_min, salary_max)::numeric, greatest(salary_min, salary_max)::numeric, '[]')"
+)
+
 
 class Job(Base):
     __tablename__ = 'jobs'
@@ -61,15 +75,52 @@ class Job(Base):
     work_type = Column(SQLEnum(WorkTypeEnum), nullable=False)
     salary_min = Column(Float, nullable=False)
     salary_max = Column(Float, nullable=False)
-    posted_date = Column(DateTime, default=datetime.utcnow)
+    posted_date = Column(DateTime, nullable=False, default=datetime.utcnow)
     description = Column(Text, default='')
     responsibilities = Column(JSONB, default=list)
     qualifications = Column(JSONB, default=list)
     is_third_party = Column(Boolean, default=False)
     redirect_url = Column(String, nullable=True)
     company_id = Column(String, ForeignKey('companies.id'), nullable=False)
+    # Identifier from the originating feed, unique per company; set by bulk ingestion.
+    external_id = Column(String, nullable=True)
+    # Geocoded from location by app.services.geo; null when the place is unknown or remote.
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12, collation='C'), nullable=True)
+    # Maintained by the jobs/companies triggers from migration 0001.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     company = relationship('Company', back_populates='jobs')
 
+    __table_args__ = (
+        Index('ix_jobs_posted_date_id', 'posted_date', 'id'),
+        Index('ix_jobs_company_id_posted_date', 'company_id', 'posted_date'),
+        Index('ix_jobs_sector_work_type_posted_date', 'sector', 'work_type', 'posted_date', 'id'),
+        Index(
+            'ux_jobs_company_external_id',
+            'company_id',
+            'external_id',
+            unique=True,
+            postgresql_where=text('external_id IS NOT NULL'),
+        ),
+        Index('ix_jobs_salary_max_id', 'salary_max', 'id'),
+        Index('ix_jobs_salary_range', text(SALARY_RANGE_SQL), postgresql_using='gist'),
+        Index('ix_jobs_geohash', 'geohash', postgresql_where=text('geohash IS NOT NULL')),
+        Index('ix_jobs_search_vector', 'search_vector', postgresql_using='gin'),
+        Index(
+            'ix_jobs_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_jobs_location_trgm',
+            'location',
+            postgresql_using='gin',
+            postgresql_ops={'location': 'gin_trgm_ops'},
+        ),
+    )
+
 
 class User(Base):
     __tablename__ = 'users'
@@ -88,4 +139,15 @@ class RedirectStat(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     job_id = Column(String, ForeignKey('jobs.id'), nullable=False)
     job_title = Column(String, nullable=False)
-    clicks = Column(Integer, default=0)
+    clicks = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index('ux_redirect_stats_job_id', 'job_id', unique=True),)
+
+
+class RedirectClickRollup(Base):
+    __tablename__ = 'redirect_click_hourly'
+    job_id = Column(String, ForeignKey('jobs.id'), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    clicks = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index('ix_redirect_click_hourly_bucket_start', 'bucket_start'),)
@@ -1,44 +1,97 @@
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
-from ..models import Company, Job, RedirectStat, User
+from ..database import get_read_session, get_session
+from ..models import Company
 from ..routers.deps import get_admin_user
 from ..schemas.company import CompanyRead
-from ..schemas.stats import AdminStats, RedirectStat as RedirectStatSchema
+from ..schemas.stats import AdminStats, RedirectAnalytics
+from ..services.admin_stats import invalidate_admin_stats, load_admin_stats
+from ..services.analytics import top_redirects
+from ..services.export import (
+    COMPANY_EXPORT_COLUMNS,
+    JOB_EXPORT_COLUMNS,
+    MEDIA_TYPES,
+    REDIRECT_EXPORT_COLUMNS,
+    companies_export_query,
+    jobs_export_query,
+    redirects_export_query,
+    stream_export,
+)
+from ..services.job_filters import JobFilters
+from ..services.pagination import InvalidCursorError
+from ..services.response_cache import JOBS_TAG, company_tag, response_cache
 
 router = APIRouter()
 
 
 @router.get("/admin/stats", response_model=AdminStats)
 async def read_admin_stats(
+    redirects_limit: int = Query(20, ge=1, le=100, alias="redirectsLimit"),
+    redirects_cursor: str | None = Query(None, alias="redirectsCursor"),
+    pending_limit: int = Query(20, ge=1, le=100, alias="pendingLimit"),
+    pending_cursor: str | None = Query(None, alias="pendingCursor"),
+    _: None = Depends(get_admin_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    try:
+        return await load_admin_stats(
+            session,
+            redirects_limit=redirects_limit,
+            redirects_cursor=redirects_cursor,
+            pending_limit=pending_limit,
+            pending_cursor=pending_cursor,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+@router.get("/admin/redirects/top", response_model=RedirectAnalytics)
+async def read_top_redirects(
+    hours: int = Query(24 * 7, ge=1, le=24 * 90),
+    bucket: str = Query("day", regex="^(hour|day)$"),
+    limit: int = Query(10, ge=1, le=100),
     _: None = Depends(get_admin_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    total_jobs = await session.scalar(select(func.count()).select_from(Job))
-    total_companies = await session.scalar(select(func.count()).select_from(Company))
-    total_users = await session.scalar(select(func.count()).select_from(User))
-    stats_result = await session.execute(select(RedirectStat))
-    redirects = stats_result.scalars().all()
-    pending_stmt = select(Company).where(Company.is_verified.is_(False))
-    pending_result = await session.execute(pending_stmt)
-    pending_companies = pending_result.scalars().all()
-    redirect_payloads: List[RedirectStatSchema] = [
-        RedirectStatSchema(jobId=stat.job_id, jobTitle=stat.job_title, clicks=stat.clicks)
-        for stat in redirects
-    ]
-    return AdminStats(
-        totalJobs=total_jobs or 0,
-        totalCompanies=total_companies or 0,
-        totalUsers=total_users or 0,
-        redirects=redirect_payloads,
-        pendingCompanies=[CompanyRead.from_orm(company) for company in pending_companies],
+    return await top_redirects(session, hours=hours, bucket=bucket, limit=limit)
+
+
+def _export_response(stmt, columns, fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(stmt, columns, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
     )
 
 
+@router.get("/admin/export/jobs")
+async def export_jobs(
+    filters: JobFilters = Depends(),
+    fmt: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$"),
+    _: None = Depends(get_admin_user),
+):
+    return _export_response(jobs_export_query(filters), JOB_EXPORT_COLUMNS, fmt, "jobs")
+
+
+@router.get("/admin/export/companies")
+async def export_companies(
+    fmt: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$"),
+    _: None = Depends(get_admin_user),
+):
+    return _export_response(companies_export_query(), COMPANY_EXPORT_COLUMNS, fmt, "companies")
+
+
+@router.get("/admin/export/redirects")
+async def export_redirects(
+    fmt: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$"),
+    _: None = Depends(get_admin_user),
+):
+    return _export_response(redirects_export_query(), REDIRECT_EXPORT_COLUMNS, fmt, "redirects")
+
+
 @router.post("/admin/companies/{company_id}/verify", response_model=CompanyRead)
 async def verify_company(company_id: str, session: AsyncSession = Depends(get_session), _=Depends(get_admin_user)):
     stmt = select(Company).where(Company.id == company_id)
@@ -49,5 +102,7 @@ async def verify_company(company_id: str, session: AsyncSession = Depends(get_se
     company.is_verified = True
     session.add(company)
     await session.commit()
+    invalidate_admin_stats()
+    await response_cache.invalidate(company_tag(company.id), JOBS_TAG)
     await session.refresh(company)
     return CompanyRead.from_orm(company)
@@ -3,10 +3,10 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import settings
-from ..core.security import create_access_token, get_password_hash, verify_password
+from ..core.security import PasswordHasherBusy, create_access_token, password_hasher
 from ..database import get_session
 from ..models import Company, User, UserRoleEnum
-from ..routers.deps import get_current_user
+from ..routers.deps import Principal, get_current_user, get_principal, invalidate_cached_user
 from ..schemas.auth import (
     AuthResponse,
     LoginRequest,
@@ -15,6 +15,8 @@ from ..schemas.auth import (
     UserCreate,
     UserRead,
 )
+from ..services.admin_stats import invalidate_admin_stats
+from ..services.matching import job_matcher
 
 router = APIRouter()
 
@@ -30,6 +32,18 @@ def _build_user_payload(user: User) -> UserRead:
     )
 
 
+def _issue_token(user: User) -> str:
+    return create_access_token(subject=user.id, role=user.role, company_id=user.company_id)
+
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=AuthResponse)
 async def register(user_in: UserCreate, session: AsyncSession = Depends(get_session)):
     if user_in.role == UserRoleEnum.ADMIN:
@@ -62,7 +76,10 @@ async def register(user_in: UserCreate, session: AsyncSession = Depends(get_sess
                 detail="Employer accounts must include a company profile or a company identifier",
             )
 
-    hashed = get_password_hash(user_in.password)
+    try:
+        hashed = await password_hasher.hash(user_in.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     user = User(
         name=user_in.name,
         email=user_in.email,
@@ -73,8 +90,9 @@ async def register(user_in: UserCreate, session: AsyncSession = Depends(get_sess
     )
     session.add(user)
     await session.commit()
+    invalidate_admin_stats()
     await session.refresh(user)
-    token = create_access_token(subject=user.id)
+    token = _issue_token(user)
     return AuthResponse(access_token=token, user=_build_user_payload(user))
 
 
@@ -84,14 +102,25 @@ async def login(credentials: LoginRequest, session: AsyncSession = Depends(get_s
         admin_stmt = await session.execute(select(User).where(User.email == settings.ADMIN_EMAIL))
         admin_user = admin_stmt.scalars().first()
         if admin_user:
-            token = create_access_token(subject=admin_user.id)
+            token = _issue_token(admin_user)
             return AuthResponse(access_token=token, user=_build_user_payload(admin_user))
 
     query = await session.execute(select(User).where(User.email == credentials.email))
     user = query.scalars().first()
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(credentials.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    token = create_access_token(subject=user.id)
+    if new_hash:
+        # The configured bcrypt cost changed since this hash was made.
+        user.hashed_password = new_hash
+        session.add(user)
+        await session.commit()
+    token = _issue_token(user)
     return AuthResponse(access_token=token, user=_build_user_payload(user))
 
 
@@ -108,7 +137,7 @@ async def login_with_google(payload: SocialLoginRequest, session: AsyncSession =
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No user found for the requested role"
         )
-    token = create_access_token(subject=user.id)
+    token = _issue_token(user)
     return AuthResponse(access_token=token, user=_build_user_payload(user))
 
 
@@ -120,16 +149,22 @@ async def read_profile(current_user: User = Depends(get_current_user)):
 @router.put("/profile", response_model=UserRead)
 async def update_profile(
     payload: ProfilePayload,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_principal),
     session: AsyncSession = Depends(get_session),
 ):
-    if current_user.role != UserRoleEnum.EMPLOYEE:
+    if principal.role != UserRoleEnum.EMPLOYEE:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only employees can update profiles")
+    result = await session.execute(select(User).where(User.id == principal.id))
+    current_user = result.scalar_one_or_none()
+    if current_user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
     update_data = payload.dict(exclude_unset=True, by_alias=True)
-    current_profile = current_user.profile or {}
+    current_profile = dict(current_user.profile or {})
     current_profile.update(update_data)
     current_user.profile = current_profile
     session.add(current_user)
     await session.commit()
+    invalidate_cached_user(current_user.id)
+    job_matcher.forget_profile(current_user.id)
     await session.refresh(current_user)
     return _build_user_payload(current_user)
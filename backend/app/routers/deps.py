@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -7,37 +9,86 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.config import settings
 from ..database import get_session
 from ..models import User, UserRoleEnum
+from ..services.cache import MISSING, TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/login")
 
+# Detached, read-only User snapshots keyed by id. Handlers that write to the
+# user load their own row and call invalidate_cached_user afterwards.
+user_cache = TTLCache(ttl_seconds=settings.USER_CACHE_TTL_SECONDS, max_entries=settings.USER_CACHE_MAX_ENTRIES)
 
-async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)) -> User:
-    credentials_exception = HTTPException(
+
+@dataclass(frozen=True)
+class Principal:
+    id: str
+    role: UserRoleEnum
+    company_id: str | None = None
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    user_cache.invalidate(user_id)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        user_id: str | None = payload.get("sub")
-        if not user_id:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    result = await session.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    if not payload.get("sub"):
+        raise _credentials_exception()
+    return payload
+
+
+async def _load_user(session: AsyncSession, user_id: str) -> User:
+    user = user_cache.get(user_id)
+    if user is MISSING:
+        result = await session.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise _credentials_exception()
+        user_cache.set(user_id, user)
     return user
 
 
-async def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role != UserRoleEnum.ADMIN:
+async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)) -> User:
+    payload = _decode_token(token)
+    return await _load_user(session, payload["sub"])
+
+
+async def get_principal(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)) -> Principal:
+    payload = _decode_token(token)
+    role = payload.get("role")
+    if role is None:
+        # Tokens issued before role claims existed.
+        user = await _load_user(session, payload["sub"])
+        return Principal(id=user.id, role=user.role, company_id=user.company_id)
+    try:
+        return Principal(id=payload["sub"], role=UserRoleEnum(role), company_id=payload.get("cid"))
+    except ValueError:
+        raise _credentials_exception()
+
+
+async def get_admin_user(principal: Principal = Depends(get_principal)) -> Principal:
+    if principal.role != UserRoleEnum.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
-    return current_user
+    return principal
 
 
-async def get_employer_user(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role != UserRoleEnum.EMPLOYER:
+async def get_employer_user(principal: Principal = Depends(get_principal)) -> Principal:
+    if principal.role != UserRoleEnum.EMPLOYER:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Employer privileges required")
-    return current_user
+    return principal
+
+
+async def get_employer_or_admin_user(principal: Principal = Depends(get_principal)) -> Principal:
+    if principal.role not in (UserRoleEnum.EMPLOYER, UserRoleEnum.ADMIN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Employer or admin privileges required")
+    return principal
@@ -1,142 +1,330 @@
-from typing import List
+from typing import List, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from ..database import get_session
-from ..models import Company, Job, JobSectorEnum, RedirectStat, WorkTypeEnum
-from ..routers.deps import get_employer_user, get_current_user
+from ..core.config import settings
+from ..database import get_read_session, get_session
+from ..models import Company, Job, JobSectorEnum, User, UserRoleEnum, WorkTypeEnum
+from ..routers.deps import Principal, get_current_user, get_employer_or_admin_user, get_employer_user
 from ..schemas.company import CompanyRead
-from ..schemas.job import JobRead
+from ..schemas.ingest import IngestReport
+from ..schemas.job import JobFacets, JobRead, JobRecommendation, JobSummary
+from ..services.admin_stats import invalidate_admin_stats
+from ..services.facets import load_facets
+from ..services.featured import featured_ranking
+from ..services.ingest import ingest_jobs
+from ..services.job_filters import JobFilters
+from ..services.matching import job_matcher
+from ..services.pagination import InvalidCursorError, cursor_for_row, keyset_condition, sort_key_columns
+from ..services.redirects import record_clicks, redirect_buffer
+from ..services.response_cache import JOBS_TAG, company_tag, job_tag, response_cache
+from ..services.serialization import dumps
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+SUMMARY_DESCRIPTION_LENGTH = 200
 
-def _build_company(job: Job) -> CompanyRead:
-    company = job.company
-    return CompanyRead(
-        id=company.id,
-        name=company.name,
-        logo=company.logo,
-        description=company.description,
-        website=company.website,
-        isVerified=company.is_verified,
-    )
 
+# Builders return plain dicts shaped like the response schemas; they are
+# encoded straight to JSON bytes instead of going through per-row Pydantic
+# construction and FastAPI's second validation pass.
+def _company_dict(company: Company) -> dict:
+    return {
+        "id": company.id,
+        "name": company.name,
+        "logo": company.logo,
+        "description": company.description,
+        "website": company.website,
+        "isVerified": company.is_verified,
+    }
 
-def _build_job_payload(job: Job) -> JobRead:
-    return JobRead(
-        id=job.id,
-        title=job.title,
-        location=job.location,
-        sector=job.sector,
-        workType=job.work_type,
-        salaryRange=[job.salary_min, job.salary_max],
-        postedDate=job.posted_date,
-        description=job.description,
-        responsibilities=job.responsibilities or [],
-        qualifications=job.qualifications or [],
-        isThirdParty=job.is_third_party,
-        redirectUrl=job.redirect_url,
-        company=_build_company(job),
-    )
 
+def _build_job_payload(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "title": job.title,
+        "location": job.location,
+        "sector": job.sector,
+        "workType": job.work_type,
+        "salaryRange": [job.salary_min, job.salary_max],
+        "postedDate": job.posted_date,
+        "description": job.description,
+        "responsibilities": job.responsibilities or [],
+        "qualifications": job.qualifications or [],
+        "isThirdParty": job.is_third_party,
+        "redirectUrl": job.redirect_url,
+        "distanceKm": None,
+        "company": _company_dict(job.company),
+    }
 
-@router.get("/jobs", response_model=List[JobRead])
-async def list_jobs(
-    title: str | None = Query(None),
-    location: str | None = Query(None),
-    sector: JobSectorEnum | None = Query(None),
-    work_type: WorkTypeEnum | None = Query(None, alias="workType"),
-    session: AsyncSession = Depends(get_session),
-):
-    stmt = select(Job).options(selectinload(Job.company)).order_by(Job.posted_date.desc())
-    if title:
-        stmt = stmt.filter(Job.title.ilike(f"%{title}%"))
-    if location:
-        stmt = stmt.filter(Job.location.ilike(f"%{location}%"))
-    if sector:
-        stmt = stmt.filter(Job.sector == sector)
-    if work_type:
-        stmt = stmt.filter(Job.work_type == work_type)
-    result = await session.execute(stmt)
-    jobs = result.scalars().all()
-    return [_build_job_payload(job) for job in jobs]
 
+def _build_job_summary(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "location": row.location,
+        "sector": row.sector,
+        "workType": row.work_type,
+        "salaryRange": [row.salary_min, row.salary_max],
+        "postedDate": row.posted_date,
+        "description": row.description or "",
+        "isThirdParty": row.is_third_party,
+        "redirectUrl": row.redirect_url,
+        "distanceKm": None,
+        "company": {
+            "id": row.company_id,
+            "name": row.company_name,
+            "logo": row.company_logo,
+            "isVerified": row.company_is_verified,
+        },
+    }
 
-@router.get("/jobs/featured", response_model=List[JobRead])
-async def featured_jobs(session: AsyncSession = Depends(get_session)):
+
+def _summary_select():
+    # Only the columns the list cards render; responsibilities/qualifications
+    # and the full description body are never read from disk.
+    return select(
+        Job.id,
+        Job.title,
+        Job.location,
+        Job.sector,
+        Job.work_type,
+        Job.salary_min,
+        Job.salary_max,
+        Job.posted_date,
+        func.left(Job.description, SUMMARY_DESCRIPTION_LENGTH).label("description"),
+        Job.is_third_party,
+        Job.redirect_url,
+        Job.company_id,
+        Company.name.label("company_name"),
+        Company.logo.label("company_logo"),
+        Company.is_verified.label("company_is_verified"),
+    ).join(Company, Job.company_id == Company.id)
+
+
+def _with_distance(payload: dict, distance_km: float | None) -> dict:
+    # Remote jobs pass every radius filter at distance 0; report no distance for them.
+    remote = payload["workType"] == WorkTypeEnum.REMOTE
+    payload["distanceKm"] = None if remote or distance_km is None else round(distance_km, 1)
+    return payload
+
+
+def _sort_keys(filters: JobFilters, sort: str | None) -> list:
+    # Every ordering ends in the primary key so keyset cursors are unambiguous.
+    if sort is None:
+        sort = "relevance" if filters.q else "date"
+    if sort == "distance":
+        if filters.center is None:
+            raise HTTPException(status_code=400, detail="sort=distance requires near")
+        return [filters.distance(), Job.id]
+    if sort == "salary":
+        return [Job.salary_max, Job.id]
+    if sort == "relevance" and filters.q:
+        return [filters.rank(), Job.posted_date, Job.id]
+    return [Job.posted_date, Job.id]
+
+
+def _jobs_query(filters: JobFilters, view: str, sort: str | None, cursor: str | None, page_size: int):
+    """The ``GET /jobs`` statement and its sort keys; fetches one extra row to detect a next page."""
+    if view == "summary":
+        stmt = _summary_select()
+    else:
+        stmt = select(Job).options(selectinload(Job.company))
+    stmt = filters.apply(stmt)
+    sort_keys = _sort_keys(filters, sort)
+    # Nearest first; every other ordering is newest/highest first.
+    descending = sort != "distance"
+    if cursor:
+        try:
+            stmt = stmt.filter(keyset_condition(sort_keys, cursor, descending))
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    if filters.center:
+        stmt = stmt.add_columns(filters.distance().label("distance_km"))
     stmt = (
+        stmt.add_columns(*sort_key_columns(sort_keys))
+        .order_by(*[key.desc() if descending else key.asc() for key in sort_keys])
+        .limit(page_size + 1)
+    )
+    return stmt, sort_keys
+
+
+def _job_detail_query(job_id: str):
+    return select(Job).options(selectinload(Job.company)).where(Job.id == job_id)
+
+
+def _company_query(company_id: str):
+    return select(Company).where(Company.id == company_id)
+
+
+def _employer_jobs_query(company_id: str):
+    return (
         select(Job)
         .options(selectinload(Job.company))
+        .where(Job.company_id == company_id)
         .order_by(Job.posted_date.desc())
-        .limit(4)
     )
+
+
+async def _query_jobs(
+    session: AsyncSession,
+    filters: JobFilters,
+    view: str,
+    sort: str | None,
+    cursor: str | None,
+    limit: int | None,
+) -> tuple[list, str | None]:
+    page_size = min(limit or settings.JOBS_PAGE_SIZE_DEFAULT, settings.JOBS_PAGE_SIZE_MAX)
+    stmt, sort_keys = _jobs_query(filters, view, sort, cursor, page_size)
     result = await session.execute(stmt)
-    jobs = result.scalars().all()
-    return [_build_job_payload(job) for job in jobs]
+    rows = result.all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = cursor_for_row(rows[-1], sort_keys)
+    if view == "summary":
+        items = [_build_job_summary(row) for row in rows]
+    else:
+        items = [_build_job_payload(row[0]) for row in rows]
+    if filters.center:
+        items = [_with_distance(item, row.distance_km) for item, row in zip(items, rows)]
+    return items, next_cursor
+
+
+@router.get("/jobs", response_model=Union[List[JobRead], List[JobSummary]])
+async def list_jobs(
+    request: Request,
+    filters: JobFilters = Depends(),
+    view: str = Query("full", regex="^(full|summary)$"),
+    sort: str | None = Query(None, regex="^(date|salary|relevance|distance)$"),
+    cursor: str | None = Query(None),
+    limit: int | None = Query(None, ge=1),
+    session: AsyncSession = Depends(get_read_session),
+):
+    async def build():
+        items, next_cursor = await _query_jobs(session, filters, view, sort, cursor, limit)
+        return items, ({NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {})
+
+    return await response_cache.respond(request, "jobs", settings.RESPONSE_CACHE_TTL_JOBS, [JOBS_TAG], build)
+
+
+@router.get("/jobs/featured", response_model=List[JobRead])
+async def featured_jobs(request: Request, sector: JobSectorEnum | None = Query(None)):
+    async def build():
+        jobs = await featured_ranking.get(sector)
+        return [_build_job_payload(job) for job in jobs], {}
+
+    return await response_cache.respond(
+        request, "featured", settings.RESPONSE_CACHE_TTL_FEATURED, [JOBS_TAG], build
+    )
+
+
+@router.get("/jobs/facets", response_model=JobFacets)
+async def job_facets(
+    request: Request,
+    filters: JobFilters = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+):
+    async def build():
+        return await load_facets(session, filters), {}
+
+    return await response_cache.respond(request, "facets", settings.RESPONSE_CACHE_TTL_FACETS, [JOBS_TAG], build)
+
+
+@router.get("/jobs/recommended", response_model=List[JobRecommendation])
+async def recommended_jobs(
+    limit: int = Query(20, ge=1),
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    if user.role != UserRoleEnum.EMPLOYEE:
+        raise HTTPException(status_code=403, detail="Only employees receive recommendations")
+    await job_matcher.ensure_loaded()
+    matches = job_matcher.recommend(user.id, user.profile, min(limit, settings.MATCH_RESULTS_MAX))
+    if not matches:
+        return Response(content=dumps([]), media_type="application/json")
+    stmt = select(Job).options(selectinload(Job.company)).where(Job.id.in_([match.job_id for match in matches]))
+    jobs = {job.id: job for job in (await session.execute(stmt)).scalars()}
+    payload = [
+        {"job": _build_job_payload(jobs[match.job_id]), "score": match.score, "matchedSkills": match.matched_skills}
+        for match in matches
+        if match.job_id in jobs
+    ]
+    return Response(content=dumps(payload), media_type="application/json")
 
 
 @router.get("/jobs/{job_id}", response_model=JobRead)
-async def get_job(job_id: str, session: AsyncSession = Depends(get_session)):
-    stmt = select(Job).options(selectinload(Job.company)).where(Job.id == job_id)
-    result = await session.execute(stmt)
-    job = result.scalars().first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    return _build_job_payload(job)
+async def get_job(job_id: str, request: Request, session: AsyncSession = Depends(get_read_session)):
+    async def build():
+        result = await session.execute(_job_detail_query(job_id))
+        job = result.scalars().first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return _build_job_payload(job), {}
+
+    # The payload embeds the company, whose writes invalidate the "jobs" tag.
+    return await response_cache.respond(
+        request, "job", settings.RESPONSE_CACHE_TTL_JOB, [JOBS_TAG, job_tag(job_id)], build
+    )
 
 
 @router.get("/companies/{company_id}", response_model=CompanyRead)
-async def get_company(company_id: str, session: AsyncSession = Depends(get_session)):
-    result = await session.execute(select(Company).where(Company.id == company_id))
-    company = result.scalars().first()
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
-    return CompanyRead(
-        id=company.id,
-        name=company.name,
-        logo=company.logo,
-        description=company.description,
-        website=company.website,
-        isVerified=company.is_verified,
+async def get_company(company_id: str, request: Request, session: AsyncSession = Depends(get_read_session)):
+    async def build():
+        result = await session.execute(_company_query(company_id))
+        company = result.scalars().first()
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
+        return _company_dict(company), {}
+
+    return await response_cache.respond(
+        request, "company", settings.RESPONSE_CACHE_TTL_COMPANY, [company_tag(company_id)], build
     )
 
 
+@router.post("/jobs/ingest", response_model=IngestReport)
+async def ingest_jobs_feed(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$"),
+    company_id: str | None = Query(None, alias="companyId"),
+    principal: Principal = Depends(get_employer_or_admin_user),
+    session: AsyncSession = Depends(get_session),
+):
+    restrict_to_company = principal.role == UserRoleEnum.EMPLOYER
+    if restrict_to_company:
+        if not principal.company_id:
+            raise HTTPException(status_code=400, detail="Employer account has no company")
+        company_id = principal.company_id
+    report = await ingest_jobs(session, request.stream(), fmt, company_id, restrict_to_company)
+    if report.inserted or report.updated:
+        await response_cache.invalidate(JOBS_TAG)
+        invalidate_admin_stats()
+    return report
+
+
 @router.post("/jobs/{job_id}/track-redirect", status_code=204)
 async def track_redirect(job_id: str, session: AsyncSession = Depends(get_session)):
-    stmt = select(Job).where(Job.id == job_id)
-    result = await session.execute(stmt)
-    job = result.scalars().first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    redirect_stmt = select(RedirectStat).where(RedirectStat.job_id == job_id)
-    redirect_result = await session.execute(redirect_stmt)
-    redirect = redirect_result.scalars().first()
-    if not redirect:
-        redirect = RedirectStat(job_id=job.id, job_title=job.title, clicks=1)
-        session.add(redirect)
-    else:
-        redirect.clicks += 1
-        session.add(redirect)
+    if redirect_buffer.enabled:
+        # Unknown job ids are dropped by the join when the batch is flushed.
+        redirect_buffer.add(job_id)
+        return
+    recorded = await record_clicks(session, {job_id: 1})
     await session.commit()
+    if job_id not in recorded:
+        raise HTTPException(status_code=404, detail="Job not found")
 
 
 @router.get("/employer/jobs", response_model=List[JobRead])
 async def employer_jobs(
     employer=Depends(get_employer_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     if not employer.company_id:
         return []
-    stmt = (
-        select(Job)
-        .options(selectinload(Job.company))
-        .where(Job.company_id == employer.company_id)
-        .order_by(Job.posted_date.desc())
-    )
-    result = await session.execute(stmt)
+    result = await session.execute(_employer_jobs_query(employer.company_id))
     jobs = result.scalars().all()
-    return [_build_job_payload(job) for job in jobs]
+    return Response(content=dumps([_build_job_payload(job) for job in jobs]), media_type="application/json")
@@ -18,3 +18,13 @@ class CompanyCreate(BaseModel):
     name: str
     description: str
     website: str | None = None
+
+
+class CompanySummary(BaseModel):
+    id: str
+    name: str
+    logo: str
+    is_verified: bool = Field(alias="isVerified")
+
+    class Config:
+        allow_population_by_field_name = True
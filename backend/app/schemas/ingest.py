@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, validator
+
+from ..models import JobSectorEnum, WorkTypeEnum
+
+
+class JobIngestRow(BaseModel):
+    external_id: str = Field(alias="externalId", min_length=1)
+    company_id: Optional[str] = Field(default=None, alias="companyId")
+    title: str = Field(min_length=1)
+    location: str = Field(min_length=1)
+    sector: JobSectorEnum
+    work_type: WorkTypeEnum = Field(alias="workType")
+    salary_min: float = Field(alias="salaryMin", ge=0)
+    salary_max: float = Field(alias="salaryMax", ge=0)
+    posted_date: Optional[datetime] = Field(default=None, alias="postedDate")
+    description: str = ""
+    responsibilities: List[str] = Field(default_factory=list)
+    qualifications: List[str] = Field(default_factory=list)
+    is_third_party: bool = Field(default=True, alias="isThirdParty")
+    redirect_url: Optional[str] = Field(default=None, alias="redirectUrl")
+
+    class Config:
+        allow_population_by_field_name = True
+
+    @validator("salary_max")
+    def salary_range_is_ordered(cls, value, values):
+        if "salary_min" in values and value < values["salary_min"]:
+            raise ValueError("salaryMax must not be lower than salaryMin")
+        return value
+
+
+class IngestRowError(BaseModel):
+    line: int
+    external_id: Optional[str] = Field(default=None, alias="externalId")
+    error: str
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class IngestReport(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[IngestRowError] = Field(default_factory=list)
+    errors_truncated: bool = Field(default=False, alias="errorsTruncated")
+
+    class Config:
+        allow_population_by_field_name = True
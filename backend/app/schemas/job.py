@@ -3,7 +3,7 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 
 from ..models import JobSectorEnum, WorkTypeEnum
-from .company import CompanyRead
+from .company import CompanyRead, CompanySummary
 
 
 class JobRead(BaseModel):
@@ -19,7 +19,57 @@ class JobRead(BaseModel):
     qualifications: list[str]
     is_third_party: bool = Field(alias="isThirdParty")
     redirect_url: str | None = Field(alias="redirectUrl")
+    distance_km: float | None = Field(None, alias="distanceKm")
     company: "CompanyRead"
 
     class Config:
         allow_population_by_field_name = True
+
+
+class JobSummary(BaseModel):
+    id: str
+    title: str
+    location: str
+    sector: JobSectorEnum
+    work_type: WorkTypeEnum = Field(alias="workType")
+    salary_range: list[float] = Field(alias="salaryRange")
+    posted_date: datetime = Field(alias="postedDate")
+    description: str
+    is_third_party: bool = Field(alias="isThirdParty")
+    redirect_url: str | None = Field(alias="redirectUrl")
+    distance_km: float | None = Field(None, alias="distanceKm")
+    company: CompanySummary
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class JobRecommendation(BaseModel):
+    job: JobRead
+    score: float
+    matched_skills: list[str] = Field(alias="matchedSkills")
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class SalaryBucketCount(BaseModel):
+    min: float | None
+    max: float | None
+    count: int
+
+
+class JobFacets(BaseModel):
+    total: int
+    sectors: list[FacetCount]
+    work_types: list[FacetCount] = Field(alias="workTypes")
+    locations: list[FacetCount]
+    salary_buckets: list[SalaryBucketCount] = Field(alias="salaryBuckets")
+
+    class Config:
+        allow_population_by_field_name = True
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List
 
 from pydantic import BaseModel, Field
@@ -19,7 +20,25 @@ class AdminStats(BaseModel):
     total_companies: int = Field(alias="totalCompanies")
     total_users: int = Field(alias="totalUsers")
     redirects: List[RedirectStat]
+    redirects_next_cursor: str | None = Field(default=None, alias="redirectsNextCursor")
     pending_companies: List[CompanyRead] = Field(alias="pendingCompanies")
+    pending_next_cursor: str | None = Field(default=None, alias="pendingNextCursor")
 
     class Config:
         allow_population_by_field_name = True
+
+
+class TopRedirect(BaseModel):
+    job_id: str = Field(alias="jobId")
+    job_title: str = Field(alias="jobTitle")
+    clicks: int
+    series: List[int]
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class RedirectAnalytics(BaseModel):
+    bucket: str
+    buckets: List[datetime]
+    jobs: List[TopRedirect]
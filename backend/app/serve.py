@@ -0,0 +1,36 @@
+"""Server entry point: ``python -m app.serve``.
+
+``SERVER_PROFILE=dev`` runs a single uvicorn process with hot reload.
+``SERVER_PROFILE=production`` hands over to gunicorn (see
+``app.gunicorn_conf``), which manages one uvloop/httptools uvicorn worker per
+CPU and recycles each worker after a jittered ``SERVER_MAX_REQUESTS``.
+Every worker has its own DB pool, so the database sees up to
+``workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)`` connections.
+"""
+import os
+import sys
+
+from .core.config import settings
+
+
+def worker_count() -> int:
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    try:
+        # Honours CPU pinning and container cpusets, unlike os.cpu_count().
+        return max(len(os.sched_getaffinity(0)), 1)
+    except AttributeError:
+        return max(os.cpu_count() or 1, 1)
+
+
+def main() -> None:
+    if settings.SERVER_PROFILE == "production":
+        os.execvp("gunicorn", ["gunicorn", "app.main:app", "--config", "python:app.gunicorn_conf"])
+
+    import uvicorn
+
+    uvicorn.run("app.main:app", host=settings.SERVER_HOST, port=settings.SERVER_PORT, reload=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
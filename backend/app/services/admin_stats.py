@@ -0,0 +1,86 @@
+"""Admin dashboard statistics with a short-lived cache.
+
+The cache is cleared by writes that change the numbers: company
+verification, registration and job creation.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models import Company, Job, RedirectStat, User
+from ..schemas.company import CompanyRead
+from ..schemas.stats import AdminStats, RedirectStat as RedirectStatSchema
+from .cache import MISSING, TTLCache
+from .pagination import cursor_for_row, keyset_condition, sort_key_columns
+
+admin_stats_cache = TTLCache(ttl_seconds=settings.ADMIN_STATS_CACHE_TTL_SECONDS, max_entries=256)
+
+
+def invalidate_admin_stats() -> None:
+    admin_stats_cache.clear()
+
+
+async def _page(session: AsyncSession, stmt, sort_keys: list, cursor: str | None, limit: int, descending: bool):
+    if cursor:
+        stmt = stmt.where(keyset_condition(sort_keys, cursor, descending=descending))
+    order = [key.desc() if descending else key.asc() for key in sort_keys]
+    stmt = stmt.add_columns(*sort_key_columns(sort_keys)).order_by(*order).limit(limit + 1)
+    rows = (await session.execute(stmt)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = cursor_for_row(rows[-1], sort_keys)
+    return rows, next_cursor
+
+
+async def load_admin_stats(
+    session: AsyncSession,
+    redirects_limit: int,
+    redirects_cursor: str | None,
+    pending_limit: int,
+    pending_cursor: str | None,
+) -> AdminStats:
+    cache_key = (redirects_limit, redirects_cursor, pending_limit, pending_cursor)
+    cached = admin_stats_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached
+
+    counts = (
+        await session.execute(
+            select(
+                select(func.count()).select_from(Job).scalar_subquery().label("jobs"),
+                select(func.count()).select_from(Company).scalar_subquery().label("companies"),
+                select(func.count()).select_from(User).scalar_subquery().label("users"),
+            )
+        )
+    ).one()
+    redirect_rows, redirects_next = await _page(
+        session,
+        select(RedirectStat),
+        [RedirectStat.clicks, RedirectStat.job_id],
+        redirects_cursor,
+        redirects_limit,
+        descending=True,
+    )
+    pending_rows, pending_next = await _page(
+        session,
+        select(Company).where(Company.is_verified.is_(False)),
+        [Company.created_at, Company.id],
+        pending_cursor,
+        pending_limit,
+        descending=False,
+    )
+    stats = AdminStats(
+        totalJobs=counts.jobs or 0,
+        totalCompanies=counts.companies or 0,
+        totalUsers=counts.users or 0,
+        redirects=[
+            RedirectStatSchema(jobId=row[0].job_id, jobTitle=row[0].job_title, clicks=row[0].clicks)
+            for row in redirect_rows
+        ],
+        redirectsNextCursor=redirects_next,
+        pendingCompanies=[CompanyRead.from_orm(row[0]) for row in pending_rows],
+        pendingNextCursor=pending_next,
+    )
+    admin_stats_cache.set(cache_key, stats)
+    return stats
@@ -0,0 +1,160 @@
+"""Per-route-class admission control.
+
+Requests are classified by method and path before routing and must take a
+slot from their class's gate. A gate admits up to ``concurrency`` requests,
+queues up to ``queue`` more for at most ``ADMISSION_QUEUE_TIMEOUT_MS``, and
+rejects everything beyond that with 503 and ``Retry-After``. A burst of
+logins or heavy searches is therefore shed within its own class, and
+cheap lookups keep their own capacity. Health and metrics endpoints are
+never gated.
+"""
+import asyncio
+import re
+from dataclasses import dataclass
+
+from ..core.config import settings
+from .serialization import dumps
+
+EXEMPT = "exempt"
+
+
+@dataclass
+class _Rule:
+    route_class: str
+    methods: frozenset[str] | None
+    pattern: re.Pattern
+
+
+def _rules(prefix: str) -> list[_Rule]:
+    def rule(route_class: str, pattern: str, *methods: str) -> _Rule:
+        return _Rule(route_class, frozenset(methods) or None, re.compile(pattern))
+
+    api = re.escape(prefix)
+    return [
+        rule(EXEMPT, r"^/(health(/.*)?|metrics|docs|redoc|openapi\.json)$"),
+        rule("auth", rf"^{api}/auth/(login|register|google)$", "POST"),
+        rule("bulk", rf"^{api}/(jobs/ingest|admin/export/.*)$"),
+        rule("admin", rf"^{api}/admin/"),
+        rule("search", rf"^{api}/jobs(/facets|/recommended)?/?$", "GET"),
+    ]
+
+
+class AdmissionRejected(Exception):
+    pass
+
+
+class AdmissionGate:
+    def __init__(self, concurrency: int, queue: int, queue_timeout: float):
+        self.concurrency = concurrency
+        self.queue = queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    async def acquire(self) -> None:
+        if self._semaphore.locked():
+            if self.waiting >= self.queue:
+                self.rejected += 1
+                raise AdmissionRejected
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise AdmissionRejected
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue": self.queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionController:
+    def __init__(self, prefix: str, limits: dict[str, tuple[int, int]], queue_timeout: float):
+        self.rules = _rules(prefix)
+        self.gates = {
+            route_class: AdmissionGate(concurrency, queue, queue_timeout)
+            for route_class, (concurrency, queue) in limits.items()
+        }
+
+    def classify(self, method: str, path: str) -> str:
+        for rule in self.rules:
+            if (rule.methods is None or method in rule.methods) and rule.pattern.match(path):
+                return rule.route_class
+        return "default"
+
+    def snapshot(self) -> dict:
+        return {route_class: gate.snapshot() for route_class, gate in self.gates.items()}
+
+
+admission_controller = AdmissionController(
+    settings.API_PREFIX,
+    {
+        "auth": (settings.ADMISSION_AUTH_CONCURRENCY, settings.ADMISSION_AUTH_QUEUE),
+        "search": (settings.ADMISSION_SEARCH_CONCURRENCY, settings.ADMISSION_SEARCH_QUEUE),
+        "admin": (settings.ADMISSION_ADMIN_CONCURRENCY, settings.ADMISSION_ADMIN_QUEUE),
+        "bulk": (settings.ADMISSION_BULK_CONCURRENCY, settings.ADMISSION_BULK_QUEUE),
+        "default": (settings.ADMISSION_DEFAULT_CONCURRENCY, settings.ADMISSION_DEFAULT_QUEUE),
+    },
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000,
+)
+
+_REJECTED_BODY = dumps({"detail": "Server is busy, please retry shortly"})
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = self.controller.classify(scope["method"], scope["path"])
+        gate = self.controller.gates.get(route_class)
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await gate.acquire()
+        except AdmissionRejected:
+            await _reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+
+async def _reject(send) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_REJECTED_BODY)).encode("latin-1")),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode("latin-1")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": _REJECTED_BODY})
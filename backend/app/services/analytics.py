@@ -0,0 +1,65 @@
+"""Redirect analytics computed from the hourly click rollups."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Job, RedirectClickRollup
+from ..schemas.stats import RedirectAnalytics, TopRedirect
+
+
+def _bucket_starts(since: datetime, until: datetime, bucket: str) -> list[datetime]:
+    if bucket == "day":
+        since = since.replace(hour=0)
+        step = timedelta(days=1)
+    else:
+        step = timedelta(hours=1)
+    starts = []
+    current = since
+    while current <= until:
+        starts.append(current)
+        current += step
+    return starts
+
+
+async def top_redirects(session: AsyncSession, hours: int, bucket: str, limit: int) -> RedirectAnalytics:
+    until = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    since = until - timedelta(hours=hours - 1)
+    in_window = RedirectClickRollup.bucket_start >= since
+
+    total = func.sum(RedirectClickRollup.clicks).label("clicks")
+    top_stmt = (
+        select(RedirectClickRollup.job_id, Job.title, total)
+        .join(Job, Job.id == RedirectClickRollup.job_id)
+        .where(in_window)
+        .group_by(RedirectClickRollup.job_id, Job.title)
+        .order_by(total.desc(), RedirectClickRollup.job_id)
+        .limit(limit)
+    )
+    top_rows = (await session.execute(top_stmt)).all()
+
+    buckets = _bucket_starts(since, until, bucket)
+    series: dict[str, dict[datetime, int]] = {row.job_id: {} for row in top_rows}
+    if top_rows:
+        bucket_start = func.date_trunc(bucket, RedirectClickRollup.bucket_start).label("bucket")
+        series_stmt = (
+            select(RedirectClickRollup.job_id, bucket_start, func.sum(RedirectClickRollup.clicks))
+            .where(in_window, RedirectClickRollup.job_id.in_(series))
+            .group_by(RedirectClickRollup.job_id, bucket_start)
+        )
+        for job_id, start, clicks in (await session.execute(series_stmt)).all():
+            series[job_id][start] = clicks
+
+    return RedirectAnalytics(
+        bucket=bucket,
+        buckets=buckets,
+        jobs=[
+            TopRedirect(
+                jobId=row.job_id,
+                jobTitle=row.title,
+                clicks=row.clicks,
+                series=[series[row.job_id].get(start, 0) for start in buckets],
+            )
+            for row in top_rows
+        ],
+    )
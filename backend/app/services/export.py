@@ -0,0 +1,106 @@
+"""Streaming NDJSON/CSV exports.
+
+Rows are read through a server-side cursor (``session.stream`` with
+``yield_per``) and written out one batch at a time, so memory use does not
+depend on the size of the table. The session is opened inside the
+generator because the response body is produced after the request's
+dependencies have been torn down.
+"""
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator
+
+from sqlalchemy import select
+
+from ..core.config import settings
+from ..database import read_sessionmaker
+from ..models import Company, Job, RedirectStat
+from .ingest import LIST_SEPARATOR
+from .job_filters import JobFilters
+from .serialization import dumps
+
+EXPORT_FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Column names match the ingest aliases so a jobs CSV can be fed back in.
+JOB_EXPORT_COLUMNS = [
+    ("id", Job.id),
+    ("externalId", Job.external_id),
+    ("companyId", Job.company_id),
+    ("companyName", Company.name),
+    ("title", Job.title),
+    ("location", Job.location),
+    ("sector", Job.sector),
+    ("workType", Job.work_type),
+    ("salaryMin", Job.salary_min),
+    ("salaryMax", Job.salary_max),
+    ("postedDate", Job.posted_date),
+    ("isThirdParty", Job.is_third_party),
+    ("redirectUrl", Job.redirect_url),
+    ("description", Job.description),
+    ("responsibilities", Job.responsibilities),
+    ("qualifications", Job.qualifications),
+]
+COMPANY_EXPORT_COLUMNS = [
+    ("id", Company.id),
+    ("name", Company.name),
+    ("logo", Company.logo),
+    ("description", Company.description),
+    ("website", Company.website),
+    ("isVerified", Company.is_verified),
+    ("createdAt", Company.created_at),
+]
+REDIRECT_EXPORT_COLUMNS = [
+    ("jobId", RedirectStat.job_id),
+    ("jobTitle", RedirectStat.job_title),
+    ("clicks", RedirectStat.clicks),
+]
+
+
+def jobs_export_query(filters: JobFilters):
+    stmt = select(*(column for _, column in JOB_EXPORT_COLUMNS)).join(Company, Job.company_id == Company.id)
+    return filters.apply(stmt).order_by(Job.posted_date.desc(), Job.id.desc())
+
+
+def companies_export_query():
+    return select(*(column for _, column in COMPANY_EXPORT_COLUMNS)).order_by(Company.created_at, Company.id)
+
+
+def redirects_export_query():
+    return select(*(column for _, column in REDIRECT_EXPORT_COLUMNS)).order_by(RedirectStat.job_id)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, list):
+        return LIST_SEPARATOR.join(str(item) for item in value)
+    return value
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(stmt, columns: list[tuple[str, Any]], fmt: str) -> AsyncIterator[bytes]:
+    names = [name for name, _ in columns]
+    async with read_sessionmaker()() as session:
+        result = await session.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_ROWS))
+        if fmt == "csv":
+            yield _csv_chunk([names])
+        async for partition in result.partitions():
+            if fmt == "csv":
+                yield _csv_chunk(partition)
+            else:
+                yield b"".join(dumps(dict(zip(names, row))) + b"\n" for row in partition)
@@ -0,0 +1,76 @@
+"""Facet counts for the job search filters.
+
+Sector, work type, location and salary-bucket counts come from one
+``GROUP BY GROUPING SETS`` query over the filtered jobs, so the catalog is
+scanned once however many facets are requested. ``GROUPING()`` tells the
+sets apart in the combined result.
+"""
+from sqlalchemy import Float, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models import Job
+from .job_filters import JobFilters
+
+
+def salary_bucket():
+    boundaries = literal(settings.FACET_SALARY_BOUNDARIES, ARRAY(Float))
+    return func.width_bucket(Job.salary_min, boundaries)
+
+
+def facet_query(filters: JobFilters):
+    base = filters.apply(
+        select(Job.sector, Job.work_type, Job.location, salary_bucket().label("salary_bucket"))
+    ).subquery()
+    columns = [base.c.sector, base.c.work_type, base.c.location, base.c.salary_bucket]
+    return select(
+        *columns,
+        func.grouping(*columns).label("grouping"),
+        func.count().label("count"),
+    ).group_by(func.grouping_sets(*(tuple_(column) for column in columns)))
+
+
+# GROUPING(sector, work_type, location, salary_bucket) sets a bit for every
+# column that is *not* grouped, most significant first.
+_SECTOR_SET = 0b0111
+_WORK_TYPE_SET = 0b1011
+_LOCATION_SET = 0b1101
+_SALARY_SET = 0b1110
+
+
+def _salary_range(index: int) -> tuple[float | None, float | None]:
+    boundaries = settings.FACET_SALARY_BOUNDARIES
+    lower = boundaries[index - 1] if index > 0 else None
+    upper = boundaries[index] if index < len(boundaries) else None
+    return lower, upper
+
+
+def _by_count(facet: dict) -> tuple:
+    return -facet["count"], str(facet["value"])
+
+
+def _by_lower_bound(facet: dict) -> float:
+    return facet["min"] if facet["min"] is not None else float("-inf")
+
+
+async def load_facets(session: AsyncSession, filters: JobFilters) -> dict:
+    rows = (await session.execute(facet_query(filters))).all()
+    sectors, work_types, locations, salaries = [], [], [], []
+    for row in rows:
+        if row.grouping == _SECTOR_SET:
+            sectors.append({"value": row.sector, "count": row.count})
+        elif row.grouping == _WORK_TYPE_SET:
+            work_types.append({"value": row.work_type, "count": row.count})
+        elif row.grouping == _LOCATION_SET:
+            locations.append({"value": row.location, "count": row.count})
+        elif row.grouping == _SALARY_SET:
+            lower, upper = _salary_range(row.salary_bucket)
+            salaries.append({"min": lower, "max": upper, "count": row.count})
+    return {
+        "total": sum(facet["count"] for facet in sectors),
+        "sectors": sorted(sectors, key=_by_count),
+        "workTypes": sorted(work_types, key=_by_count),
+        "locations": sorted(locations, key=_by_count)[: settings.FACET_LOCATION_LIMIT],
+        "salaryBuckets": sorted(salaries, key=_by_lower_bound),
+    }
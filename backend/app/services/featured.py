@@ -0,0 +1,128 @@
+"""Featured-jobs ranking, recomputed in the background and served from memory.
+
+Each job is scored from three signals:
+
+* recency, decaying by half every ``FEATURED_RECENCY_HALF_LIFE_HOURS``;
+* whether its company is verified;
+* redirect clicks from ``redirect_stats``, squashed to ``[0, 1)`` with
+  ``ln(1 + c) / (1 + ln(1 + c))`` so a single viral posting cannot dominate.
+
+The refresh keeps the top ``FEATURED_LIMIT`` jobs per sector. The overall
+list is the best of those, since any job in the overall top N is also in its
+own sector's top N.
+"""
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import Float, Integer, cast, func, select
+from sqlalchemy.orm import selectinload
+
+from ..core.config import settings
+from ..database import read_sessionmaker
+from ..models import Company, Job, JobSectorEnum, RedirectStat
+
+logger = logging.getLogger(__name__)
+
+MAX_HALF_LIVES = 1000
+
+
+def featured_score():
+    # posted_date is naive UTC, so compare it with a naive UTC "now".
+    age = func.timezone("UTC", func.now()) - Job.posted_date
+    age_hours = func.greatest(cast(func.extract("epoch", age), Float) / 3600, 0)
+    # 0.5 ** 1000 is already ~1e-301; past roughly 1074 half-lives power() raises an underflow error.
+    half_lives = func.least(age_hours / settings.FEATURED_RECENCY_HALF_LIFE_HOURS, MAX_HALF_LIVES)
+    recency = func.power(0.5, half_lives)
+    verified = cast(func.coalesce(Company.is_verified, False), Integer)
+    log_clicks = func.ln(1 + func.coalesce(RedirectStat.clicks, 0))
+    clicks = log_clicks / (1 + log_clicks)
+    return (
+        settings.FEATURED_WEIGHT_RECENCY * recency
+        + settings.FEATURED_WEIGHT_VERIFIED * verified
+        + settings.FEATURED_WEIGHT_CLICKS * clicks
+    )
+
+
+def featured_query(limit: int):
+    scored = (
+        select(Job.id, Job.sector, featured_score().label("score"))
+        .join(Company, Job.company_id == Company.id)
+        .outerjoin(RedirectStat, RedirectStat.job_id == Job.id)
+        .subquery()
+    )
+    ranked = select(
+        scored.c.id,
+        scored.c.sector,
+        scored.c.score,
+        func.row_number()
+        .over(partition_by=scored.c.sector, order_by=(scored.c.score.desc(), scored.c.id))
+        .label("sector_rank"),
+    ).subquery()
+    return (
+        select(ranked.c.id, ranked.c.sector)
+        .where(ranked.c.sector_rank <= limit)
+        .order_by(ranked.c.score.desc(), ranked.c.id)
+    )
+
+
+class FeaturedRanking:
+    """Holds the latest ranking as loaded ``Job`` rows, so reads never hit the database."""
+
+    def __init__(self, limit: int, refresh_seconds: int):
+        self.limit = limit
+        self.refresh_seconds = refresh_seconds
+        self.overall: list[Job] = []
+        self.by_sector: dict[JobSectorEnum, list[Job]] = {}
+        self.refreshed_at: datetime | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            async with read_sessionmaker()() as session:
+                ranked = (await session.execute(featured_query(self.limit))).all()
+                stmt = select(Job).options(selectinload(Job.company)).where(Job.id.in_([row.id for row in ranked]))
+                jobs = {job.id: job for job in (await session.execute(stmt)).scalars()}
+            overall: list[Job] = []
+            by_sector: dict[JobSectorEnum, list[Job]] = {}
+            for row in ranked:
+                job = jobs.get(row.id)
+                if job is None:
+                    continue
+                by_sector.setdefault(job.sector, []).append(job)
+                if len(overall) < self.limit:
+                    overall.append(job)
+            self.overall, self.by_sector = overall, by_sector
+            self.refreshed_at = datetime.utcnow()
+
+    async def get(self, sector: JobSectorEnum | None = None) -> list[Job]:
+        if self.refreshed_at is None:
+            await self.refresh()
+        if sector is None:
+            return self.overall
+        return self.by_sector.get(sector, [])
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh featured jobs")
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+featured_ranking = FeaturedRanking(limit=settings.FEATURED_LIMIT, refresh_seconds=settings.FEATURED_REFRESH_SECONDS)
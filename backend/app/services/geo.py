@@ -0,0 +1,289 @@
+"""Offline geocoding and geohash radius search for job locations.
+
+Locations are resolved against the gazetteer bundled in
+``app/data/gazetteer.csv``, keyed on the city name optionally followed by
+its region and/or country (``"Portland, OR"``, ``"Berlin, Germany"``,
+``"Pune"``). Resolved jobs store ``latitude``/``longitude`` and a geohash.
+
+The geohash B-tree gives the spatial index without needing PostGIS. A radius
+query first takes the handful of geohash cells covering the circle's
+bounding box, as index range scans, and then applies the exact haversine
+distance. Remote jobs are location-independent, so they can be kept in
+every radius search at distance 0.
+"""
+import csv
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from sqlalchemy import Float, and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Job, WorkTypeEnum
+
+GAZETTEER_PATH = Path(__file__).resolve().parents[1] / "data" / "gazetteer.csv"
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9
+# Radius queries never use more than this many geohash cells; at worse
+# precision the cells are simply bigger and the haversine check does more.
+MAX_COVER_CELLS = 16
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Sorts after every geohash character, so "<cell>" <= h < "<cell>{" is a prefix match.
+_CELL_END = "{"
+
+COUNTRY_NAMES = {
+    "us": ("usa", "united states", "united states of america", "u.s.", "u.s.a."),
+    "ca": ("canada",),
+    "mx": ("mexico", "méxico"),
+    "gb": ("uk", "united kingdom", "england", "scotland", "great britain"),
+    "ie": ("ireland",),
+    "fr": ("france",),
+    "de": ("germany", "deutschland"),
+    "nl": ("netherlands", "the netherlands", "holland"),
+    "be": ("belgium",),
+    "dk": ("denmark",),
+    "se": ("sweden",),
+    "no": ("norway",),
+    "fi": ("finland",),
+    "es": ("spain", "españa"),
+    "pt": ("portugal",),
+    "it": ("italy", "italia"),
+    "at": ("austria",),
+    "ch": ("switzerland",),
+    "pl": ("poland",),
+    "cz": ("czech republic", "czechia"),
+    "hu": ("hungary",),
+    "gr": ("greece",),
+    "tr": ("turkey", "türkiye"),
+    "in": ("india",),
+    "sg": ("singapore",),
+    "jp": ("japan",),
+    "kr": ("south korea", "korea"),
+    "cn": ("china",),
+    "hk": ("hong kong",),
+    "th": ("thailand",),
+    "id": ("indonesia",),
+    "ph": ("philippines",),
+    "ae": ("uae", "united arab emirates"),
+    "il": ("israel",),
+    "au": ("australia",),
+    "nz": ("new zealand",),
+    "ke": ("kenya",),
+    "za": ("south africa",),
+    "ng": ("nigeria",),
+    "eg": ("egypt",),
+    "br": ("brazil", "brasil"),
+    "ar": ("argentina",),
+    "cl": ("chile",),
+    "co": ("colombia",),
+    "pe": ("peru",),
+}
+_COUNTRY_ALIASES = {name: code for code, names in COUNTRY_NAMES.items() for name in names}
+REGION_NAMES = {
+    # United States
+    "al": "alabama", "ak": "alaska", "az": "arizona", "ar": "arkansas", "ca": "california",
+    "co": "colorado", "ct": "connecticut", "de": "delaware", "dc": "district of columbia",
+    "fl": "florida", "ga": "georgia", "hi": "hawaii", "id": "idaho", "il": "illinois",
+    "in": "indiana", "ia": "iowa", "ks": "kansas", "ky": "kentucky", "la": "louisiana",
+    "me": "maine", "md": "maryland", "ma": "massachusetts", "mi": "michigan", "mn": "minnesota",
+    "ms": "mississippi", "mo": "missouri", "mt": "montana", "ne": "nebraska", "nv": "nevada",
+    "nh": "new hampshire", "nj": "new jersey", "nm": "new mexico", "ny": "new york",
+    "nc": "north carolina", "nd": "north dakota", "oh": "ohio", "ok": "oklahoma", "or": "oregon",
+    "pa": "pennsylvania", "ri": "rhode island", "sc": "south carolina", "sd": "south dakota",
+    "tn": "tennessee", "tx": "texas", "ut": "utah", "vt": "vermont", "va": "virginia",
+    "wa": "washington", "wv": "west virginia", "wi": "wisconsin", "wy": "wyoming",
+    # Canada
+    "ab": "alberta", "bc": "british columbia", "mb": "manitoba", "nb": "new brunswick",
+    "nl": "newfoundland and labrador", "ns": "nova scotia", "on": "ontario", "pe": "prince edward island",
+    "qc": "quebec", "sk": "saskatchewan",
+    # Australia
+    "nsw": "new south wales", "qld": "queensland", "vic": "victoria", "tas": "tasmania",
+    # India
+    "dl": "delhi", "gj": "gujarat", "ka": "karnataka", "mh": "maharashtra", "tg": "telangana",
+    "tn": "tamil nadu", "wb": "west bengal",
+}
+_REGION_ALIASES = {name: code for code, name in REGION_NAMES.items()}
+# Trailing parts that pin a location down; they are never dropped to force a match.
+_QUALIFIERS = set(COUNTRY_NAMES) | set(REGION_NAMES)
+_POINT_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+class UnknownPlaceError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class GeoPoint:
+    latitude: float
+    longitude: float
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return " ".join("".join(char for char in text if not unicodedata.combining(char)).split())
+
+
+def _location_parts(location: str) -> list[str]:
+    parts = [part for part in (_fold(part) for part in location.split(",")) if part]
+    # Only the parts after the place name are normalised to codes, so
+    # "Singapore" or "Washington, DC" keep their own names.
+    return parts[:1] + [_COUNTRY_ALIASES.get(part, _REGION_ALIASES.get(part, part)) for part in parts[1:]]
+
+
+@lru_cache(maxsize=1)
+def _gazetteer() -> dict[str, GeoPoint]:
+    places: dict[str, GeoPoint] = {}
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            point = GeoPoint(float(row["latitude"]), float(row["longitude"]))
+            names = [row["name"], *filter(None, row["aliases"].split("|"))]
+            region, country = row["region"].lower(), row["country"].lower()
+            for name in (_fold(name) for name in names):
+                keys = [name, f"{name}, {country}"]
+                if region:
+                    keys += [f"{name}, {region}", f"{name}, {region}, {country}"]
+                for key in keys:
+                    # First entry wins, so list the larger of two namesakes first.
+                    places.setdefault(key, point)
+    return places
+
+
+def geocode(location: str | None) -> GeoPoint | None:
+    if not location:
+        return None
+    parts = _location_parts(location)
+    places = _gazetteer()
+    for size in range(len(parts), 0, -1):
+        point = places.get(", ".join(parts[:size]))
+        if point is not None:
+            return point
+        # Unrecognised trailing parts (a postcode, a district) may be dropped,
+        # but a region or country that did not match means a different place.
+        if parts[size - 1] in _QUALIFIERS:
+            return None
+    return None
+
+
+def resolve_place(near: str) -> GeoPoint:
+    """A ``"lat,lon"`` pair or a gazetteer place name."""
+    match = _POINT_RE.match(near)
+    if match:
+        latitude, longitude = float(match.group(1)), float(match.group(2))
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            return GeoPoint(latitude, longitude)
+    point = geocode(near)
+    if point is None:
+        raise UnknownPlaceError(f"Unknown place: {near}")
+    return point
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def location_columns(location: str | None) -> dict:
+    """Column values for ``Job.latitude``/``longitude``/``geohash`` from a location string."""
+    point = geocode(location)
+    if point is None:
+        return {"latitude": None, "longitude": None, "geohash": None}
+    return {
+        "latitude": point.latitude,
+        "longitude": point.longitude,
+        "geohash": geohash_encode(point.latitude, point.longitude),
+    }
+
+
+def _cell_size_degrees(precision: int) -> tuple[float, float]:
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def covering_cells(center: GeoPoint, radius_km: float) -> list[str] | None:
+    """Geohash prefixes covering the circle's bounding box, or None if it is too large to bother."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = max(center.latitude - lat_delta, -90.0), min(center.latitude + lat_delta, 90.0)
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 89.0:
+        return None
+    lon_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(widest))))
+    if lon_delta >= 180.0:
+        return None
+    min_lon, max_lon = center.longitude - lon_delta, center.longitude + lon_delta
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lon_step = _cell_size_degrees(precision)
+        rows = math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step) + 1
+        columns = math.floor(max_lon / lon_step) - math.floor(min_lon / lon_step) + 1
+        if rows * columns > MAX_COVER_CELLS:
+            continue
+        first_row, first_column = math.floor(min_lat / lat_step), math.floor(min_lon / lon_step)
+        cells = set()
+        for row in range(first_row, first_row + rows):
+            latitude = (row + 0.5) * lat_step
+            for column in range(first_column, first_column + columns):
+                # Cell centres; wrap longitudes across the antimeridian.
+                longitude = ((column + 0.5) * lon_step + 180.0) % 360.0 - 180.0
+                cells.add(geohash_encode(latitude, longitude, precision))
+        return sorted(cells)
+    return None
+
+
+def distance_km(center: GeoPoint):
+    """Great-circle distance from ``center`` to the job, via the haversine formula."""
+    lat1, lon1 = math.radians(center.latitude), math.radians(center.longitude)
+    lat2, lon2 = func.radians(Job.latitude), func.radians(Job.longitude)
+    a = func.power(func.sin((lat2 - lat1) * 0.5), 2) + math.cos(lat1) * func.cos(lat2) * func.power(
+        func.sin((lon2 - lon1) * 0.5), 2
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)), type_=Float)
+
+
+def job_distance(center: GeoPoint):
+    """Distance used for filtering and sorting; remote jobs count as 0 km away."""
+    return case((Job.work_type == WorkTypeEnum.REMOTE, 0.0), else_=distance_km(center))
+
+
+def within_radius(center: GeoPoint, radius_km: float, include_remote: bool):
+    local = [Job.geohash.isnot(None), distance_km(center) <= radius_km]
+    cells = covering_cells(center, radius_km)
+    if cells is not None:
+        local.append(or_(*(and_(Job.geohash >= cell, Job.geohash < cell + _CELL_END) for cell in cells)))
+    condition = and_(*local)
+    if include_remote:
+        return or_(Job.work_type == WorkTypeEnum.REMOTE, condition)
+    return condition
+
+
+async def geocode_missing_jobs(session: AsyncSession) -> int:
+    """Backfill coordinates for jobs whose location has not been geocoded yet."""
+    result = await session.execute(select(Job.location).where(Job.geohash.is_(None)).distinct())
+    updated = 0
+    for location in result.scalars().all():
+        columns = location_columns(location)
+        if columns["geohash"] is None:
+            continue
+        outcome = await session.execute(
+            update(Job).where(Job.location == location, Job.geohash.is_(None)).values(**columns)
+        )
+        updated += outcome.rowcount
+    await session.commit()
+    return updated
@@ -0,0 +1,335 @@
+"""Streaming bulk import of job postings from NDJSON or CSV feeds.
+
+The input is consumed as a stream of byte chunks, parsed record by record
+and upserted ``INGEST_CHUNK_SIZE`` rows at a time with a multi-row
+``INSERT ... ON CONFLICT (company_id, external_id) DO UPDATE``. Each chunk
+is committed on its own, so memory stays bounded by the chunk size and a
+bad row only costs its own chunk a retry.
+
+CSV files need a header row with the ``JobIngestRow`` aliases as column
+names; ``responsibilities`` and ``qualifications`` are ``|``-separated.
+Quoted fields may span lines, up to ``INGEST_MAX_RECORD_BYTES`` per record;
+past that the record is reported as unterminated and parsing resumes on
+the next line.
+
+    python -m app.services.ingest feed.csv --format csv --company-id <id>
+"""
+import argparse
+import asyncio
+import codecs
+import csv
+import json
+import sys
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Iterable
+
+from pydantic import ValidationError
+from sqlalchemy import literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models import Company, Job
+from ..schemas.ingest import IngestReport, IngestRowError, JobIngestRow
+from .geo import location_columns
+from .matching import job_matcher
+
+INGEST_FORMATS = ("ndjson", "csv")
+LIST_SEPARATOR = "|"
+LIST_FIELDS = {"responsibilities", "qualifications"}
+# Postgres caps a statement at 32767 bind parameters.
+MAX_BIND_PARAMETERS = 32767
+UPDATABLE_COLUMNS = [
+    "title",
+    "location",
+    "sector",
+    "work_type",
+    "salary_min",
+    "salary_max",
+    "description",
+    "responsibilities",
+    "qualifications",
+    "is_third_party",
+    "redirect_url",
+    "latitude",
+    "longitude",
+    "geohash",
+]
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *complete, buffer = buffer.split("\n")
+        for line in complete:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _ndjson_records(lines: AsyncIterator[str]):
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield line_no, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, data, None
+
+
+async def _csv_records(lines: AsyncIterator[str]):
+    header: list[str] | None = None
+    pending: list[str] = []
+    pending_size = 0
+    quotes = 0
+    line_no = 0
+    start_line = 0
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start_line = line_no
+        pending.append(line)
+        pending_size += len(line) + 1
+        quotes += line.count('"')
+        if quotes % 2:
+            # A quoted field continues on the next line, unless a stray quote
+            # has swallowed too much: drop what was collected and resync on
+            # the next line rather than buffering the rest of the feed.
+            if pending_size > settings.INGEST_MAX_RECORD_BYTES:
+                yield start_line, None, f"Unterminated quoted field; skipped lines {start_line}-{line_no}"
+                pending, pending_size, quotes = [], 0, 0
+            continue
+        text = "\n".join(pending)
+        pending, pending_size, quotes = [], 0, 0
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as exc:
+            yield start_line, None, f"Invalid CSV: {exc}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start_line, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        record: dict = {}
+        for name, value in zip(header, values):
+            if value == "":
+                continue
+            record[name] = value.split(LIST_SEPARATOR) if name in LIST_FIELDS else value
+        yield start_line, record, None
+    if pending:
+        yield start_line, None, "Unterminated quoted field"
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class _Ingestor:
+    def __init__(self, session: AsyncSession, company_id: str | None, restrict_to_company: bool):
+        self.session = session
+        self.company_id = company_id
+        self.restrict_to_company = restrict_to_company
+        self.report = IngestReport()
+        self.written: list[tuple[str, JobIngestRow]] = []
+
+    def fail(self, line: int, error: str, external_id: str | None = None) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < settings.INGEST_MAX_REPORTED_ERRORS:
+            self.report.errors.append(IngestRowError(line=line, externalId=external_id, error=error))
+        else:
+            self.report.errors_truncated = True
+
+    def validate(self, line: int, record: dict) -> JobIngestRow | None:
+        try:
+            row = JobIngestRow.parse_obj(record)
+        except ValidationError as exc:
+            self.fail(line, _format_validation_error(exc), record.get("externalId"))
+            return None
+        if self.restrict_to_company:
+            if row.company_id and row.company_id != self.company_id:
+                self.fail(line, "companyId does not match your company", row.external_id)
+                return None
+            row.company_id = self.company_id
+        else:
+            row.company_id = row.company_id or self.company_id
+            if not row.company_id:
+                self.fail(line, "companyId is required", row.external_id)
+                return None
+        return row
+
+    async def _known_companies(self, rows: Iterable[JobIngestRow]) -> set[str]:
+        company_ids = {row.company_id for row in rows}
+        result = await self.session.execute(select(Company.id).where(Company.id.in_(company_ids)))
+        return set(result.scalars().all())
+
+    async def _upsert(self, rows: list[JobIngestRow], with_posted_date: bool) -> None:
+        now = datetime.utcnow()
+        values = [
+            {
+                "id": str(uuid.uuid4()),
+                "external_id": row.external_id,
+                "company_id": row.company_id,
+                "title": row.title,
+                "location": row.location,
+                "sector": row.sector,
+                "work_type": row.work_type,
+                "salary_min": row.salary_min,
+                "salary_max": row.salary_max,
+                "posted_date": row.posted_date or now,
+                "description": row.description,
+                "responsibilities": row.responsibilities,
+                "qualifications": row.qualifications,
+                "is_third_party": row.is_third_party,
+                "redirect_url": row.redirect_url,
+                **location_columns(row.location),
+            }
+            for row in rows
+        ]
+        # One bind parameter per column per row; large chunks go out as
+        # several statements in the same transaction.
+        rows_per_statement = MAX_BIND_PARAMETERS // len(values[0])
+        by_key = {(row.company_id, row.external_id): row for row in rows}
+        for start in range(0, len(values), rows_per_statement):
+            stmt = insert(Job).values(values[start : start + rows_per_statement])
+            updates = {name: stmt.excluded[name] for name in UPDATABLE_COLUMNS}
+            if with_posted_date:
+                updates["posted_date"] = stmt.excluded.posted_date
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.company_id, Job.external_id],
+                index_where=Job.external_id.isnot(None),
+                set_=updates,
+            ).returning(Job.id, Job.company_id, Job.external_id, literal_column("(xmax = 0)").label("inserted"))
+            result = (await self.session.execute(stmt)).all()
+            self.written.extend((job.id, by_key[(job.company_id, job.external_id)]) for job in result)
+            inserted = sum(1 for row in result if row.inserted)
+            self.report.inserted += inserted
+            self.report.updated += len(result) - inserted
+
+    async def _write(self, rows: list[JobIngestRow]) -> None:
+        # Rows without a postedDate keep the stored date on update, so a
+        # nightly re-import does not bump every posting to the top.
+        dated = [row for row in rows if row.posted_date is not None]
+        undated = [row for row in rows if row.posted_date is None]
+        if dated:
+            await self._upsert(dated, with_posted_date=True)
+        if undated:
+            await self._upsert(undated, with_posted_date=False)
+
+    def commit_written(self) -> None:
+        for job_id, row in self.written:
+            job_matcher.index_job(job_id, row.title, row.responsibilities, row.qualifications)
+        self.written = []
+
+    async def flush(self, chunk: list[tuple[int, JobIngestRow]]) -> None:
+        if not chunk:
+            return
+        # Last occurrence wins, as if the rows had been upserted one by one.
+        latest: dict[tuple[str, str], tuple[int, JobIngestRow]] = {}
+        for line, row in chunk:
+            latest[(row.company_id, row.external_id)] = (line, row)
+        known = await self._known_companies(row for _, row in latest.values())
+        rows = []
+        for line, row in latest.values():
+            if row.company_id in known:
+                rows.append((line, row))
+            else:
+                self.fail(line, "Unknown companyId", row.external_id)
+        if not rows:
+            return
+        try:
+            await self._write([row for _, row in rows])
+            await self.session.commit()
+            self.commit_written()
+        except DBAPIError:
+            await self.session.rollback()
+            self.written = []
+            await self._flush_one_by_one(rows)
+
+    async def _flush_one_by_one(self, rows: list[tuple[int, JobIngestRow]]) -> None:
+        for line, row in rows:
+            try:
+                await self._write([row])
+                await self.session.commit()
+                self.commit_written()
+            except DBAPIError as exc:
+                await self.session.rollback()
+                self.written = []
+                self.fail(line, str(exc.orig).splitlines()[0] if exc.orig else str(exc), row.external_id)
+
+
+async def ingest_jobs(
+    session: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    company_id: str | None,
+    restrict_to_company: bool,
+) -> IngestReport:
+    records = _csv_records(_lines(chunks)) if fmt == "csv" else _ndjson_records(_lines(chunks))
+    ingestor = _Ingestor(session, company_id, restrict_to_company)
+    chunk: list[tuple[int, JobIngestRow]] = []
+    async for line, record, error in records:
+        ingestor.report.received += 1
+        if error is not None:
+            ingestor.fail(line, error)
+            continue
+        row = ingestor.validate(line, record)
+        if row is None:
+            continue
+        chunk.append((line, row))
+        if len(chunk) >= settings.INGEST_CHUNK_SIZE:
+            await ingestor.flush(chunk)
+            chunk = []
+    await ingestor.flush(chunk)
+    return ingestor.report
+
+
+async def _file_chunks(path: str, chunk_size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with (sys.stdin.buffer if path == "-" else open(path, "rb")) as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def _main(path: str, fmt: str, company_id: str | None) -> IngestReport:
+    from ..database import AsyncSessionLocal, engine
+
+    try:
+        async with AsyncSessionLocal() as session:
+            return await ingest_jobs(session, _file_chunks(path), fmt, company_id, restrict_to_company=False)
+    finally:
+        await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.services.ingest")
+    parser.add_argument("path", help="feed file, or - for stdin")
+    parser.add_argument("--format", choices=INGEST_FORMATS, default="ndjson")
+    parser.add_argument("--company-id", help="company for rows without a companyId column")
+    args = parser.parse_args()
+    report = asyncio.run(_main(args.path, args.format, args.company_id))
+    print(report.json(by_alias=True, indent=2))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
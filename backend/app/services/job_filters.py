@@ -0,0 +1,82 @@
+"""Job search filters shared by the list, export and facet endpoints."""
+from fastapi import HTTPException, Query
+from sqlalchemy import Numeric, cast, func, literal_column, or_
+
+from ..core.config import settings
+from ..models import Job, JobSectorEnum, WorkTypeEnum
+from .geo import UnknownPlaceError, job_distance, resolve_place, within_radius
+from .search import search_query, search_rank
+
+
+def salary_range():
+    # Mirrors models.SALARY_RANGE_SQL so the GiST expression index matches;
+    # the bounds flag is inlined rather than bound for the same reason.
+    return func.numrange(
+        cast(func.least(Job.salary_min, Job.salary_max), Numeric),
+        cast(func.greatest(Job.salary_min, Job.salary_max), Numeric),
+        literal_column("'[]'"),
+    )
+
+
+class JobFilters:
+    def __init__(
+        self,
+        q: str | None = Query(None),
+        title: str | None = Query(None),
+        location: str | None = Query(None),
+        sector: JobSectorEnum | None = Query(None),
+        work_type: WorkTypeEnum | None = Query(None, alias="workType"),
+        min_salary: float | None = Query(None, alias="minSalary", ge=0),
+        max_salary: float | None = Query(None, alias="maxSalary", ge=0),
+        near: str | None = Query(None),
+        radius_km: float = Query(settings.GEO_RADIUS_DEFAULT_KM, alias="radiusKm", gt=0, le=settings.GEO_RADIUS_MAX_KM),
+        include_remote: bool = Query(True, alias="includeRemote"),
+    ):
+        if min_salary is not None and max_salary is not None and min_salary > max_salary:
+            raise HTTPException(status_code=400, detail="minSalary must not exceed maxSalary")
+        try:
+            self.center = resolve_place(near) if near else None
+        except UnknownPlaceError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        self.q = q
+        self.title = title
+        self.location = location
+        self.sector = sector
+        self.work_type = work_type
+        self.min_salary = min_salary
+        self.max_salary = max_salary
+        self.near = near
+        self.radius_km = radius_km
+        self.include_remote = include_remote
+
+    def ts_query(self):
+        return search_query(self.q) if self.q else None
+
+    def rank(self):
+        return search_rank(self.ts_query()) if self.q else None
+
+    def distance(self):
+        return job_distance(self.center) if self.center else None
+
+    def apply(self, stmt):
+        if self.q:
+            stmt = stmt.filter(Job.search_vector.op("@@")(self.ts_query()))
+        if self.title:
+            stmt = stmt.filter(Job.title.ilike(f"%{self.title}%"))
+        if self.location:
+            stmt = stmt.filter(
+                or_(Job.location.ilike(f"%{self.location}%"), Job.location.op("%>")(self.location))
+            )
+        if self.sector:
+            stmt = stmt.filter(Job.sector == self.sector)
+        if self.work_type:
+            stmt = stmt.filter(Job.work_type == self.work_type)
+        if self.min_salary is not None or self.max_salary is not None:
+            # Jobs whose advertised range overlaps the requested one.
+            wanted = func.numrange(
+                cast(self.min_salary, Numeric), cast(self.max_salary, Numeric), literal_column("'[]'")
+            )
+            stmt = stmt.filter(salary_range().op("&&")(wanted))
+        if self.center:
+            stmt = stmt.filter(within_radius(self.center, self.radius_km, self.include_remote))
+        return stmt
@@ -0,0 +1,199 @@
+"""Candidate–job matching over an in-memory TF-IDF inverted index.
+
+Jobs are indexed from their title, responsibilities and qualifications as
+unigrams and bigrams, so multi-word skills like "project management" match
+as a phrase. Each posting stores the job's length-normalised log term
+frequency. A profile is scored by walking only the postings of its own
+terms, which is the sparse matrix-vector product done term by term.
+
+The index lives in each worker process. Ingest updates it as jobs are
+committed, and a periodic rebuild picks up writes from other workers.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from sqlalchemy import select
+
+from ..core.config import settings
+from ..database import read_sessionmaker
+from ..models import Job
+from .cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the this to we will with you your".split()
+)
+# Terms found in more than this share of a large catalog ("experience",
+# "team") carry almost no signal but have the longest posting lists.
+_MAX_DF_RATIO = 0.5
+_MAX_DF_MIN_JOBS = 100
+
+TITLE_WEIGHT = 2.0
+SKILL_WEIGHT = 2.0
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = [token.rstrip(".") for token in _TOKEN_RE.findall(text.lower())]
+    tokens = [token for token in tokens if token and token not in _STOPWORDS]
+    return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def _weigh(weighted_texts: Iterable[tuple[str, float]]) -> Counter:
+    counts: Counter = Counter()
+    for text, weight in weighted_texts:
+        if text:
+            for term in tokenize(text):
+                counts[term] += weight
+    return counts
+
+
+def job_terms(title: str, responsibilities: list[str] | None, qualifications: list[str] | None) -> Counter:
+    texts = [(title, TITLE_WEIGHT)]
+    texts += [(line, 1.0) for line in responsibilities or []]
+    texts += [(line, 1.0) for line in qualifications or []]
+    return _weigh(texts)
+
+
+def profile_terms(profile: dict[str, Any] | None) -> Counter:
+    profile = profile or {}
+    texts = [(skill, SKILL_WEIGHT) for skill in profile.get("skills") or []]
+    texts.append((profile.get("summary") or "", 1.0))
+    for entry in profile.get("experience") or []:
+        texts += [(entry.get("title") or "", 1.0), (entry.get("description") or "", 1.0)]
+    for entry in profile.get("education") or []:
+        texts += [(entry.get("degree") or "", 1.0), (entry.get("fieldOfStudy") or "", 1.0)]
+    return _weigh(texts)
+
+
+@dataclass
+class Match:
+    job_id: str
+    score: float
+    matched_skills: list[str]
+
+
+class JobMatcher:
+    def __init__(self, refresh_seconds: int, profile_cache: TTLCache):
+        self.refresh_seconds = refresh_seconds
+        self._postings: dict[str, dict[str, float]] = defaultdict(dict)
+        self._job_terms: dict[str, frozenset[str]] = {}
+        self._profiles = profile_cache
+        self._loaded = False
+        self._replay: dict[str, tuple] = {}
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def job_count(self) -> int:
+        return len(self._job_terms)
+
+    def index_job(self, job_id: str, title: str, responsibilities: list[str] | None, qualifications: list[str] | None) -> None:
+        if self._lock.locked():
+            self._replay[job_id] = (title, responsibilities, qualifications)
+        self.remove_job(job_id)
+        counts = job_terms(title, responsibilities, qualifications)
+        weights = {term: 1 + math.log(count) for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        for term, weight in weights.items():
+            self._postings[term][job_id] = weight / norm
+        self._job_terms[job_id] = frozenset(weights)
+
+    def remove_job(self, job_id: str) -> None:
+        for term in self._job_terms.pop(job_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def forget_profile(self, user_id: str) -> None:
+        self._profiles.invalidate(user_id)
+
+    def _profile_weights(self, user_id: str, profile: dict[str, Any] | None) -> dict[str, float]:
+        weights = self._profiles.get(user_id)
+        if weights is MISSING:
+            weights = {term: 1 + math.log(count) for term, count in profile_terms(profile).items()}
+            self._profiles.set(user_id, weights)
+        return weights
+
+    def recommend(self, user_id: str, profile: dict[str, Any] | None, limit: int) -> list[Match]:
+        total = self.job_count
+        if not total:
+            return []
+        max_df = total * _MAX_DF_RATIO if total >= _MAX_DF_MIN_JOBS else total
+        scores: dict[str, float] = defaultdict(float)
+        for term, query_weight in self._profile_weights(user_id, profile).items():
+            postings = self._postings.get(term)
+            if not postings or len(postings) > max_df:
+                continue
+            idf = math.log(1 + total / len(postings))
+            factor = query_weight * idf * idf
+            for job_id, weight in postings.items():
+                scores[job_id] += factor * weight
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        skills = [(skill, set(tokenize(skill))) for skill in (profile or {}).get("skills") or []]
+        return [
+            Match(
+                job_id=job_id,
+                score=round(score, 6),
+                matched_skills=[skill for skill, terms in skills if terms and terms <= self._job_terms[job_id]],
+            )
+            for job_id, score in best
+        ]
+
+    async def rebuild(self) -> None:
+        async with self._lock:
+            fresh = JobMatcher(self.refresh_seconds, self._profiles)
+            stmt = select(Job.id, Job.title, Job.responsibilities, Job.qualifications)
+            async with read_sessionmaker()() as session:
+                result = await session.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_ROWS))
+                async for partition in result.partitions():
+                    for row in partition:
+                        fresh.index_job(row.id, row.title, row.responsibilities, row.qualifications)
+                    # Let requests run between batches on large catalogs.
+                    await asyncio.sleep(0)
+            # Jobs indexed while the snapshot was streaming may be missing from it.
+            for job_id, fields in self._replay.items():
+                fresh.index_job(job_id, *fields)
+            self._replay.clear()
+            self._postings, self._job_terms = fresh._postings, fresh._job_terms
+            self._loaded = True
+
+    async def ensure_loaded(self) -> None:
+        if not self._loaded:
+            await self.rebuild()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Failed to rebuild the job matching index")
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+job_matcher = JobMatcher(
+    refresh_seconds=settings.MATCH_INDEX_REFRESH_SECONDS,
+    profile_cache=TTLCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_ENTRIES),
+)
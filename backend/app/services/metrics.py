@@ -0,0 +1,213 @@
+"""Per-request latency and SQL metrics.
+
+``MetricsMiddleware`` times every sampled request and attributes SQL to it
+through a context variable that the engine-level cursor hooks update. That
+variable reaches SQLAlchemy's sync event hooks because the async engine
+runs them in a greenlet sharing the task's context. Statements slower than
+``METRICS_SLOW_QUERY_MS`` are logged and kept in a short ring buffer whether
+or not the request was sampled.
+
+Histograms use fixed buckets, so recording costs a bisect and a few
+additions. Percentiles on the metrics endpoint are interpolated within the
+buckets.
+"""
+import bisect
+import logging
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+STATEMENT_LOG_LENGTH = 2000
+
+
+class Histogram:
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                # Overflow bucket has no upper bound; report its lower edge.
+                upper = self.bounds[index] if index < len(self.bounds) else lower
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {str(bound): count for bound, count in zip((*self.bounds, "+Inf"), self.counts)},
+        }
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    sql_seconds: float = 0.0
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sql_seconds = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.statuses: dict[str, int] = {}
+
+    def record(self, seconds: float, stats: RequestStats, status: int) -> None:
+        self.latency.observe(seconds)
+        self.sql_seconds.observe(stats.sql_seconds)
+        self.queries.observe(stats.queries)
+        status_class = f"{status // 100}xx"
+        self.statuses[status_class] = self.statuses.get(status_class, 0) + 1
+
+    def snapshot(self) -> dict:
+        return {
+            "latencySeconds": self.latency.snapshot(),
+            "sqlSeconds": self.sql_seconds.snapshot(),
+            "queriesPerRequest": self.queries.snapshot(),
+            "statuses": dict(self.statuses),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, slow_query_log_size: int):
+        self.routes: dict[str, RouteMetrics] = {}
+        self.slow_queries: deque[dict] = deque(maxlen=slow_query_log_size)
+        self.sampled = 0
+        self.skipped = 0
+        self.started_at = datetime.utcnow()
+
+    def record(self, route: str, seconds: float, stats: RequestStats, status: int) -> None:
+        metrics = self.routes.get(route)
+        if metrics is None:
+            metrics = self.routes[route] = RouteMetrics()
+        metrics.record(seconds, stats, status)
+
+    def record_slow_query(self, statement: str, seconds: float) -> None:
+        logger.warning("Slow query (%.1f ms): %s", seconds * 1000, statement[:STATEMENT_LOG_LENGTH])
+        self.slow_queries.append(
+            {
+                "at": datetime.utcnow(),
+                "durationMs": round(seconds * 1000, 3),
+                "statement": statement[:STATEMENT_LOG_LENGTH],
+            }
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            "startedAt": self.started_at,
+            "sampleRate": settings.METRICS_SAMPLE_RATE,
+            "sampledRequests": self.sampled,
+            "skippedRequests": self.skipped,
+            "routes": {route: metrics.snapshot() for route, metrics in sorted(self.routes.items())},
+            "slowQueries": list(self.slow_queries),
+        }
+
+
+metrics_registry = MetricsRegistry(settings.METRICS_SLOW_QUERY_LOG_SIZE)
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    elapsed = time.perf_counter() - started
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.sql_seconds += elapsed
+    if elapsed * 1000 >= settings.METRICS_SLOW_QUERY_MS:
+        metrics_registry.record_slow_query(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute.
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started_at"):
+        conn.info["query_started_at"].pop()
+
+
+def install_query_hooks() -> None:
+    """Attach the cursor hooks to every engine, primary and replicas alike."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return f"{scope['method']} {path}" if path else f"{scope['method']} <unmatched>"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed responses are timed to their last byte."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            metrics_registry.skipped += 1
+            await self.app(scope, receive, send)
+            return
+        metrics_registry.sampled += 1
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.METRICS_SERVER_TIMING:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    timing = (
+                        f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                        f"app;dur={elapsed_ms:.1f}"
+                    )
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            metrics_registry.record(_route_name(scope), time.perf_counter() - started, stats, status)
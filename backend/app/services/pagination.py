@@ -0,0 +1,69 @@
+"""Opaque keyset cursors used by paginated list endpoints."""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, String, tuple_
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    serialised = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(serialised, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> list[Any]:
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError("Malformed cursor")
+    return values
+
+
+def parse_cursor_datetime(value: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+
+def _parse_cursor_value(key, value: Any) -> Any:
+    # Cursors come from clients, so each value must match its key's type
+    # before it reaches the driver; a mismatch there would be a 500.
+    if isinstance(key.type, DateTime):
+        return parse_cursor_datetime(value)
+    if isinstance(key.type, String):
+        valid = isinstance(value, str)
+    elif isinstance(key.type, Integer):
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    else:
+        # Float/Numeric columns and untyped expressions such as ts_rank_cd().
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if not valid:
+        raise InvalidCursorError("Malformed cursor")
+    return value
+
+
+def keyset_condition(sort_keys: list, token: str, descending: bool = True):
+    values = decode_cursor(token, len(sort_keys))
+    values = [_parse_cursor_value(key, value) for key, value in zip(sort_keys, values)]
+    if descending:
+        return tuple_(*sort_keys) < tuple(values)
+    return tuple_(*sort_keys) > tuple(values)
+
+
+def sort_key_columns(sort_keys: list) -> list:
+    return [key.label(f"sort_{index}") for index, key in enumerate(sort_keys)]
+
+
+def cursor_for_row(row, sort_keys: list) -> str:
+    return encode_cursor(*(row._mapping[f"sort_{index}"] for index in range(len(sort_keys))))
@@ -0,0 +1,146 @@
+"""Redirect click counting.
+
+Clicks are recorded with a single ``INSERT ... ON CONFLICT DO UPDATE`` per
+batch into both the lifetime counter and the hourly rollup, so concurrent
+clicks on the same job can never overwrite each other.
+
+When ``REDIRECT_BUFFER_ENABLED`` is set, clicks are first combined per job in
+memory and flushed every ``REDIRECT_BUFFER_FLUSH_MS`` or once
+``REDIRECT_BUFFER_MAX_EVENTS`` clicks are pending, whichever comes first.
+"""
+import asyncio
+import logging
+import uuid
+from collections import Counter
+
+from sqlalchemy import Integer, String, column, func, select, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..database import AsyncSessionLocal
+from ..models import Job, RedirectClickRollup, RedirectStat
+
+logger = logging.getLogger(__name__)
+
+
+def current_bucket():
+    return func.date_trunc("hour", func.timezone("UTC", func.now()))
+
+
+def record_clicks_statement(clicks: dict[str, int]):
+    """One statement updating the lifetime counter and the current hourly rollup.
+
+    The rollup insert reads the job ids returned by the counter upsert, so
+    unknown jobs are skipped in both.
+    """
+    # Sorted so concurrent batches lock rows in the same order.
+    batch = select(
+        values(
+            column("id", String),
+            column("job_id", String),
+            column("clicks", Integer),
+            name="batch_values",
+        ).data([(str(uuid.uuid4()), job_id, clicks[job_id]) for job_id in sorted(clicks)])
+    ).cte("batch")
+    counted = insert(RedirectStat).from_select(
+        ["id", "job_id", "job_title", "clicks"],
+        select(batch.c.id, Job.id, Job.title, batch.c.clicks).join(Job, Job.id == batch.c.job_id),
+    )
+    counted = (
+        counted.on_conflict_do_update(
+            index_elements=[RedirectStat.job_id],
+            set_={"clicks": RedirectStat.clicks + counted.excluded.clicks},
+        )
+        .returning(RedirectStat.job_id)
+        .cte("counted")
+    )
+    rollup = insert(RedirectClickRollup).from_select(
+        ["job_id", "bucket_start", "clicks"],
+        select(counted.c.job_id, current_bucket(), batch.c.clicks).join(
+            batch, batch.c.job_id == counted.c.job_id
+        ),
+    )
+    rollup = rollup.on_conflict_do_update(
+        index_elements=[RedirectClickRollup.job_id, RedirectClickRollup.bucket_start],
+        set_={"clicks": RedirectClickRollup.clicks + rollup.excluded.clicks},
+    ).returning(RedirectClickRollup.job_id)
+    return rollup
+
+
+async def record_clicks(session: AsyncSession, clicks: dict[str, int]) -> set[str]:
+    """Add ``clicks`` to each job's counter and return the job ids that exist."""
+    if not clicks:
+        return set()
+    result = await session.execute(record_clicks_statement(clicks))
+    return set(result.scalars().all())
+
+
+class RedirectClickBuffer:
+    def __init__(self, enabled: bool, flush_interval_ms: int, max_events: int, max_pending: int):
+        self.enabled = enabled
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_events = max_events
+        self.max_pending = max_pending
+        self._pending: Counter[str] = Counter()
+        self._pending_events = 0
+        self._full = asyncio.Event()
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+    def add(self, job_id: str) -> None:
+        self._pending[job_id] += 1
+        self._pending_events += 1
+        if self._pending_events >= self.max_events:
+            self._full.set()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        # Swap before awaiting so clicks arriving mid-flush land in the next batch.
+        batch, self._pending = self._pending, Counter()
+        self._pending_events = 0
+        try:
+            async with AsyncSessionLocal() as session:
+                await record_clicks(session, dict(batch))
+                await session.commit()
+        except Exception:
+            events = sum(batch.values())
+            logger.exception("Failed to flush %d buffered redirect clicks", events)
+            if self._pending_events + events > self.max_pending:
+                logger.error("Dropping %d redirect clicks: retry buffer is full", events)
+                return
+            self._pending.update(batch)
+            self._pending_events += events
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            await self.flush()
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Wake the loop and let an in-flight flush finish; cancelling it
+            # would lose the batch it has already taken from _pending.
+            self._stopping = True
+            self._full.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+redirect_buffer = RedirectClickBuffer(
+    enabled=settings.REDIRECT_BUFFER_ENABLED,
+    flush_interval_ms=settings.REDIRECT_BUFFER_FLUSH_MS,
+    max_events=settings.REDIRECT_BUFFER_MAX_EVENTS,
+    max_pending=settings.REDIRECT_BUFFER_MAX_PENDING,
+)
@@ -0,0 +1,266 @@
+"""Cached JSON responses with strong ETags for the public read endpoints.
+
+Entries are keyed on the route name, path parameters and the normalized
+query string, and carry tags (``jobs``, ``job:<id>``, ``company:<id>``) so
+writes can drop every response that embeds the changed row.
+
+``RESPONSE_CACHE_BACKEND`` selects ``memory`` (per-worker LRU, the default),
+``redis`` (shared between workers, needs the optional ``redis`` package and
+``RESPONSE_CACHE_URL``) or ``none``. Conditional GETs are answered with 304
+whichever backend is used. Bodies above ``COMPRESSION_MIN_SIZE`` are
+compressed lazily, off the event loop, in the coding each client negotiates.
+The result is kept on the entry, so later hits in the same coding are not
+compressed again.
+"""
+import base64
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from .cache import MISSING, TTLCache
+from .compression import SUPPORTED_ENCODINGS, compress, compressible, negotiate
+from .serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: dict[str, str] = field(default_factory=dict)
+    media_type: str = "application/json"
+    # Compressed variants of ``body`` keyed by content coding, filled on demand.
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    def dumps(self) -> bytes:
+        return json.dumps(
+            {
+                "body": base64.b64encode(self.body).decode("ascii"),
+                "etag": self.etag,
+                "headers": self.headers,
+                "media_type": self.media_type,
+                "encoded": {name: base64.b64encode(body).decode("ascii") for name, body in self.encoded.items()},
+            }
+        ).encode("utf-8")
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CachedResponse":
+        data = json.loads(raw)
+        data["body"] = base64.b64decode(data["body"])
+        data["encoded"] = {name: base64.b64decode(body) for name, body in data.get("encoded", {}).items()}
+        return cls(**data)
+
+
+class _TaggedTTLCache(TTLCache):
+    def __init__(self, max_entries: int):
+        super().__init__(ttl_seconds=0, max_entries=max_entries)
+        self._tags: dict[str, set[Hashable]] = {}
+        self._key_tags: dict[Hashable, tuple[str, ...]] = {}
+
+    def set_tagged(self, key: Hashable, value: Any, ttl_seconds: float, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        self._key_tags[key] = tags
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self.set(key, value, ttl_seconds=ttl_seconds)
+
+    def invalidate(self, key: Hashable) -> None:
+        super().invalidate(key)
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate_tag(self, tag: str) -> None:
+        for key in list(self._tags.get(tag, ())):
+            self.invalidate(key)
+
+
+class MemoryBackend:
+    stores_entries = True
+
+    def __init__(self, max_entries: int):
+        self._cache = _TaggedTTLCache(max_entries=max_entries)
+
+    async def get(self, key: str) -> CachedResponse | None:
+        entry = self._cache.get(key)
+        return None if entry is MISSING else entry
+
+    async def set(self, key: str, entry: CachedResponse, ttl_seconds: int, tags: list[str]) -> None:
+        self._cache.set_tagged(key, entry, ttl_seconds, tags)
+
+    async def invalidate_tags(self, tags: list[str]) -> None:
+        for tag in tags:
+            self._cache.invalidate_tag(tag)
+
+
+class RedisBackend:
+    stores_entries = True
+
+    def __init__(self, url: str, prefix: str = "response-cache:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self._redis = redis_asyncio.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> CachedResponse | None:
+        raw = await self._redis.get(self._prefix + key)
+        return CachedResponse.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, entry: CachedResponse, ttl_seconds: int, tags: list[str]) -> None:
+        pipe = self._redis.pipeline()
+        pipe.set(self._prefix + key, entry.dumps(), ex=ttl_seconds)
+        for tag in tags:
+            tag_key = f"{self._prefix}tag:{tag}"
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl_seconds, gt=True)
+            pipe.expire(tag_key, ttl_seconds, nx=True)
+        await pipe.execute()
+
+    async def invalidate_tags(self, tags: list[str]) -> None:
+        for tag in tags:
+            tag_key = f"{self._prefix}tag:{tag}"
+            keys = await self._redis.smembers(tag_key)
+            pipe = self._redis.pipeline()
+            for key in keys:
+                pipe.delete(self._prefix + key.decode())
+            pipe.delete(tag_key)
+            await pipe.execute()
+
+
+class NullBackend:
+    stores_entries = False
+
+    async def get(self, key: str) -> CachedResponse | None:
+        return None
+
+    async def set(self, key: str, entry: CachedResponse, ttl_seconds: int, tags: list[str]) -> None:
+        return None
+
+    async def invalidate_tags(self, tags: list[str]) -> None:
+        return None
+
+
+def _build_backend():
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        if not settings.RESPONSE_CACHE_URL:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires RESPONSE_CACHE_URL")
+        return RedisBackend(settings.RESPONSE_CACHE_URL)
+    if settings.RESPONSE_CACHE_BACKEND == "none":
+        return NullBackend()
+    return MemoryBackend(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def cache_key(route: str, request: Request) -> str:
+    params = sorted((name, value) for name, value in request.query_params.multi_items() if value != "")
+    path_params = sorted(request.path_params.items())
+    raw = json.dumps([route, path_params, params], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _negotiate(entry: CachedResponse, accept_encoding: str | None) -> str | None:
+    return negotiate(accept_encoding, available=SUPPORTED_ENCODINGS if compressible(entry.body) else ())
+
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def respond(
+        self,
+        request: Request,
+        route: str,
+        ttl_seconds: int,
+        tags: list[str],
+        build: Callable[[], Awaitable[tuple[Any, dict[str, str]]]],
+    ) -> Response:
+        key = cache_key(route, request)
+        try:
+            entry = await self.backend.get(key)
+        except Exception:
+            logger.exception("Response cache read failed")
+            entry = None
+        accept_encoding = request.headers.get("accept-encoding")
+        if entry is None:
+            payload, headers = await build()
+            body = dumps(payload)
+            entry = CachedResponse(body=body, etag=_etag_for(body), headers=headers)
+            encoding = _negotiate(entry, accept_encoding)
+            if self.backend.stores_entries:
+                # Compressed before storing so a shared backend keeps the variant too.
+                if encoding is not None:
+                    await self._compress(entry, encoding)
+                try:
+                    await self.backend.set(key, entry, ttl_seconds, tags)
+                except Exception:
+                    logger.exception("Response cache write failed")
+        else:
+            encoding = _negotiate(entry, accept_encoding)
+        # Each coding is a different representation, so it gets its own strong ETag.
+        etag = entry.etag if encoding is None else f'{entry.etag[:-1]}-{encoding}"'
+        headers = {
+            **entry.headers,
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={ttl_seconds}",
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        if encoding is None:
+            return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+        # A hit may be the first request in this coding. The variant is kept on
+        # the local copy only: re-storing the entry could resurrect one that was
+        # invalidated in the meantime.
+        await self._compress(entry, encoding)
+        headers["Content-Encoding"] = encoding
+        return Response(content=entry.encoded[encoding], media_type=entry.media_type, headers=headers)
+
+    async def _compress(self, entry: CachedResponse, encoding: str) -> None:
+        if encoding in entry.encoded:
+            return
+        # Stored entries are served many times, so they get the slower, denser brotli setting.
+        quality = settings.COMPRESSION_CACHED_BROTLI_QUALITY if self.backend.stores_entries else None
+        entry.encoded[encoding] = await run_in_threadpool(compress, entry.body, encoding, quality)
+
+    async def invalidate(self, *tags: str) -> None:
+        try:
+            await self.backend.invalidate_tags(list(tags))
+        except Exception:
+            logger.exception("Response cache invalidation failed")
+
+
+response_cache = ResponseCache(_build_backend())
+
+
+def job_tag(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def company_tag(company_id: str) -> str:
+    return f"company:{company_id}"
+
+
+JOBS_TAG = "jobs"
@@ -0,0 +1,18 @@
+"""Postgres full-text and trigram search support for job postings.
+
+The ``search_vector`` column, its triggers and indexes are created by
+migration ``0001`` in ``app.migrations``.
+"""
+from sqlalchemy import func, literal_column
+
+from ..models import Job
+
+SEARCH_CONFIG = "english"
+
+
+def search_query(q: str):
+    return func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), q)
+
+
+def search_rank(ts_query):
+    return func.ts_rank_cd(Job.search_vector, ts_query)
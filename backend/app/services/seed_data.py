@@ -1,4 +1,11 @@
-from sqlalchemy import select
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import settings
@@ -7,17 +14,22 @@ from ..database import AsyncSessionLocal, Base, engine
 from ..models import (
     Company,
     Job,
+    RedirectClickRollup,
     RedirectStat,
     User,
     JobSectorEnum,
     WorkTypeEnum,
     UserRoleEnum,
 )
+from ..migrations import ensure_extensions, run_migrations
+from .geo import location_columns
 
 
 async def init_db():
     async with engine.begin() as conn:
+        await ensure_extensions(conn)
         await conn.run_sync(Base.metadata.create_all)
+    await run_migrations()
 
 
 async def seed_default_data():
@@ -232,3 +244,135 @@ async def seed_default_data():
             session.add(admin)
 
         await session.commit()
+
+
+# Synthetic catalogs for benchmarking. Ids are deterministic, so a load
+# driver can address jobs as f"{SYNTHETIC_JOB_PREFIX}{n}" without a lookup.
+SYNTHETIC_COMPANY_PREFIX = 'synthetic-company-'
+SYNTHETIC_JOB_PREFIX = 'synthetic-job-'
+SYNTHETIC_LOCATIONS = [
+    'Portland, OR', 'Denver, CO', 'Austin, TX', 'Seattle, WA', 'Boston, MA', 'Chicago, IL',
+    'San Francisco, CA', 'New York, NY', 'Berlin, Germany', 'London, UK', 'Pune, India', 'Remote',
+]
+SYNTHETIC_ROLES = [
+    'Solar Installer', 'Wind Turbine Technician', 'Sustainability Analyst', 'ESG Consultant',
+    'Conservation Scientist', 'Energy Data Engineer', 'Project Manager', 'Frontend Developer',
+    'Grant Writer', 'GIS Specialist', 'Policy Advisor', 'Recycling Program Coordinator',
+]
+SYNTHETIC_SKILLS = [
+    'data analysis', 'project management', 'GIS', 'python', 'stakeholder engagement',
+    'carbon accounting', 'field research', 'grant writing', 'react', 'electrical safety',
+    'public speaking', 'life cycle assessment', 'SQL', 'permitting', 'community outreach',
+]
+
+
+def _synthetic_job(index: int, company_ids: list[str], rng: random.Random, now: datetime) -> dict:
+    role = rng.choice(SYNTHETIC_ROLES)
+    salary_min = rng.randrange(30_000, 150_000, 1_000)
+    skills = rng.sample(SYNTHETIC_SKILLS, 3)
+    job = {
+        'id': f'{SYNTHETIC_JOB_PREFIX}{index}',
+        'external_id': f'{SYNTHETIC_JOB_PREFIX}{index}',
+        'company_id': company_ids[index % len(company_ids)],
+        'title': f'{rng.choice(["", "Senior ", "Junior ", "Lead "])}{role}',
+        'location': rng.choice(SYNTHETIC_LOCATIONS),
+        'sector': rng.choice(list(JobSectorEnum)),
+        'work_type': rng.choice(list(WorkTypeEnum)),
+        'salary_min': salary_min,
+        'salary_max': salary_min + rng.randrange(5_000, 60_000, 1_000),
+        'posted_date': now - timedelta(minutes=rng.randrange(0, 60 * 24 * 365)),
+        'description': f'{role} role focused on {skills[0]} and {skills[1]}.',
+        'responsibilities': [f'Lead {skills[0]} initiatives.', f'Report on {skills[1]} outcomes.'],
+        'qualifications': [f'Experience with {skill}.' for skill in skills],
+        'is_third_party': rng.random() < 0.2,
+        'redirect_url': None,
+    }
+    # Geocoded afterwards so the rng draw order, and with it the seeded catalog, is unchanged.
+    job.update(location_columns(job['location']))
+    return job
+
+
+async def reset_synthetic_catalog(session: AsyncSession) -> None:
+    synthetic_jobs = select(Job.id).where(Job.id.startswith(SYNTHETIC_JOB_PREFIX))
+    await session.execute(delete(RedirectStat).where(RedirectStat.job_id.in_(synthetic_jobs)))
+    await session.execute(delete(RedirectClickRollup).where(RedirectClickRollup.job_id.in_(synthetic_jobs)))
+    await session.execute(delete(Job).where(Job.id.startswith(SYNTHETIC_JOB_PREFIX)))
+    await session.execute(delete(Company).where(Company.id.startswith(SYNTHETIC_COMPANY_PREFIX)))
+    await session.commit()
+
+
+async def seed_synthetic_catalog(jobs: int, companies: int = 500, seed: int = 0, batch_size: int = 5_000) -> None:
+    """Insert ``jobs`` deterministic synthetic postings spread over ``companies`` employers.
+
+    Replaces any previous synthetic catalog. A tenth of the jobs get redirect
+    stats so the admin dashboard and featured ranking have data to work on.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    company_ids = [f'{SYNTHETIC_COMPANY_PREFIX}{index}' for index in range(companies)]
+    async with AsyncSessionLocal() as session:
+        await reset_synthetic_catalog(session)
+        await session.execute(
+            insert(Company),
+            [
+                {
+                    'id': company_id,
+                    'name': f'Synthetic Employer {index}',
+                    'logo': f'https://picsum.photos/seed/{company_id}/100',
+                    'description': 'Synthetic company for benchmarking.',
+                    'website': f'https://{company_id}.example.com',
+                    'is_verified': index % 4 != 0,
+                    'created_at': now - timedelta(days=index % 365),
+                }
+                for index, company_id in enumerate(company_ids)
+            ],
+        )
+        await session.commit()
+        for start in range(0, jobs, batch_size):
+            batch = [_synthetic_job(index, company_ids, rng, now) for index in range(start, min(start + batch_size, jobs))]
+            await session.execute(insert(Job), batch)
+            stats = [
+                {
+                    'id': f'synthetic-redirect-{job["id"]}',
+                    'job_id': job['id'],
+                    'job_title': job['title'],
+                    'clicks': rng.randrange(1, 500),
+                }
+                for job in batch
+                if rng.random() < 0.1
+            ]
+            if stats:
+                await session.execute(insert(RedirectStat), stats)
+            await session.commit()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from ..bootstrap import bootstrap
+
+    try:
+        await bootstrap()
+        if args.reset:
+            async with AsyncSessionLocal() as session:
+                await reset_synthetic_catalog(session)
+            return
+        started = time.perf_counter()
+        await seed_synthetic_catalog(args.jobs, args.companies, args.seed, args.batch_size)
+        print(f'Seeded {args.jobs} synthetic jobs in {time.perf_counter() - started:.1f}s')
+    finally:
+        await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m app.services.seed_data')
+    parser.add_argument('--jobs', type=int, default=10_000, help='e.g. 10000, 100000 or 1000000')
+    parser.add_argument('--companies', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=5_000)
+    parser.add_argument('--reset', action='store_true', help='remove the synthetic catalog and exit')
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""JSON encoding for hot responses.
+
+Payloads are plain dicts/lists shaped like the API schemas and are encoded
+straight to bytes, with ``orjson`` when it is installed and the stdlib
+encoder otherwise. Pydantic models are still accepted and dumped by alias.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.dict(by_alias=True)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode("utf-8")
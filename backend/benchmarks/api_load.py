@@ -0,0 +1,193 @@
+"""Concurrent load benchmark for the main API endpoints.
+
+Install ``requirements-bench.txt``, seed a synthetic catalog, then drive a
+running server:
+
+    python -m app.services.seed_data --jobs 100000           # from backend/
+    python -m benchmarks.api_load --catalog-size 100000 --save baseline.json
+    python -m benchmarks.api_load --catalog-size 100000 --compare baseline.json
+
+Each scenario runs ``--concurrency`` workers for ``--seconds`` and reports
+throughput and p50/p95/p99 latency. ``--compare`` exits non-zero when a
+scenario's p95 grows, or its throughput drops, by more than ``--tolerance``.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.models import JobSectorEnum, WorkTypeEnum
+from app.services.seed_data import SYNTHETIC_JOB_PREFIX, SYNTHETIC_LOCATIONS
+from benchmarks.stats import percentile
+
+Scenario = Callable[[httpx.AsyncClient, random.Random], Awaitable[httpx.Response]]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    seconds: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def build_scenarios(catalog_size: int, login: dict, admin_headers: dict) -> dict[str, Scenario]:
+    def job_id(rng: random.Random) -> str:
+        return f"{SYNTHETIC_JOB_PREFIX}{rng.randrange(catalog_size)}"
+
+    async def list_jobs(client, rng):
+        params = {"view": "summary", "limit": 20}
+        choice = rng.random()
+        if choice < 0.3:
+            params["sector"] = rng.choice(list(JobSectorEnum)).value
+            params["workType"] = rng.choice(list(WorkTypeEnum)).value
+        elif choice < 0.5:
+            params["q"] = rng.choice(["solar", "analyst", "project manager", "GIS"])
+        elif choice < 0.6:
+            params["location"] = rng.choice(SYNTHETIC_LOCATIONS).split(",")[0]
+        elif choice < 0.7:
+            params["minSalary"] = rng.randrange(40_000, 120_000, 10_000)
+            params["sort"] = "salary"
+        return await client.get("/jobs", params=params)
+
+    async def job_detail(client, rng):
+        return await client.get(f"/jobs/{job_id(rng)}")
+
+    async def track_redirect(client, rng):
+        return await client.post(f"/jobs/{job_id(rng)}/track-redirect")
+
+    async def auth_login(client, rng):
+        return await client.post("/auth/login", json=login)
+
+    async def admin_stats(client, rng):
+        return await client.get("/admin/stats", headers=admin_headers)
+
+    return {
+        "list_jobs": list_jobs,
+        "job_detail": job_detail,
+        "track_redirect": track_redirect,
+        "login": auth_login,
+        "admin_stats": admin_stats,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, name: str, scenario: Scenario, concurrency: int, seconds: float, seed: int
+) -> ScenarioResult:
+    samples: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed * 10_000 + worker_id)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await scenario(client, rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            samples.append((time.perf_counter() - started) * 1000)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return ScenarioResult(
+        name=name,
+        requests=len(samples),
+        errors=errors,
+        seconds=round(elapsed, 3),
+        rps=round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        p50_ms=round(percentile(samples, 50), 2),
+        p95_ms=round(percentile(samples, 95), 2),
+        p99_ms=round(percentile(samples, 99), 2),
+    )
+
+
+def compare(results: list[ScenarioResult], baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    previous = {entry["name"]: entry for entry in baseline["results"]}
+    for result in results:
+        before = previous.get(result.name)
+        if before is None:
+            continue
+        if before["p95_ms"] and result.p95_ms > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{result.name}: p95 {before['p95_ms']}ms -> {result.p95_ms}ms")
+        if before["rps"] and result.rps < before["rps"] * (1 - tolerance):
+            regressions.append(f"{result.name}: throughput {before['rps']} -> {result.rps} req/s")
+    return regressions
+
+
+def _report(result: ScenarioResult) -> None:
+    print(
+        f"{result.name:>15}: n={result.requests:6d} err={result.errors:4d} "
+        f"{result.rps:8.1f} req/s  p50={result.p50_ms:7.1f}ms p95={result.p95_ms:7.1f}ms p99={result.p99_ms:7.1f}ms"
+    )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api_load")
+    parser.add_argument("--base-url", default="http://localhost:8000/api")
+    parser.add_argument("--catalog-size", type=int, default=10_000, help="jobs seeded by app.services.seed_data")
+    parser.add_argument("--scenarios", default="list_jobs,job_detail,track_redirect,login,admin_stats")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--email", default="alex.doe@example.com")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--admin-email", default="admin@greenjobs.example.com")
+    parser.add_argument("--admin-password", default="password123")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30, limits=limits) as client:
+        response = await client.post("/auth/login", json={"email": args.admin_email, "password": args.admin_password})
+        response.raise_for_status()
+        admin_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        scenarios = build_scenarios(
+            args.catalog_size, {"email": args.email, "password": args.password}, admin_headers
+        )
+        results = []
+        for name in args.scenarios.split(","):
+            result = await run_scenario(client, name, scenarios[name], args.concurrency, args.seconds, args.seed)
+            _report(result)
+            results.append(result)
+
+    if args.save:
+        with open(args.save, "w") as handle:
+            json.dump(
+                {
+                    "catalogSize": args.catalog_size,
+                    "concurrency": args.concurrency,
+                    "seconds": args.seconds,
+                    "results": [asdict(result) for result in results],
+                },
+                handle,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
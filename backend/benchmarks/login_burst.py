@@ -0,0 +1,75 @@
+"""Measure /jobs latency before and during a burst of logins.
+
+Needs ``requirements-bench.txt``.
+
+    python -m benchmarks.login_burst --base-url http://localhost:8000/api   # from backend/
+
+With bcrypt off the event loop, p99 for /jobs during the burst should stay
+close to the idle baseline.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from benchmarks.stats import percentile
+
+
+async def _probe_jobs(client: httpx.AsyncClient, stop: asyncio.Event, samples: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/jobs", params={"view": "summary", "limit": 20})
+        samples.append((time.perf_counter() - started) * 1000)
+
+
+async def _login_burst(client: httpx.AsyncClient, logins: int, concurrency: int, email: str, password: str) -> None:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def _one() -> None:
+        async with slots:
+            await client.post("/auth/login", json={"email": email, "password": password})
+
+    await asyncio.gather(*(_one() for _ in range(logins)))
+
+
+async def _phase(client: httpx.AsyncClient, seconds: float, burst=None) -> list[float]:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe_jobs(client, stop, samples))
+    if burst is not None:
+        await burst
+    else:
+        await asyncio.sleep(seconds)
+    stop.set()
+    await probe
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    print(
+        f"{label:>8}: n={len(samples):5d} "
+        f"p50={statistics.median(samples) if samples else 0:7.1f}ms "
+        f"p99={percentile(samples, 99):7.1f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000/api")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    parser.add_argument("--email", default="alex.doe@example.com")
+    parser.add_argument("--password", default="password123")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        _report("baseline", await _phase(client, args.baseline_seconds))
+        burst = _login_burst(client, args.logins, args.concurrency, args.email, args.password)
+        _report("burst", await _phase(client, 0, burst))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""Compare the Pydantic response path with the dict + orjson fast path.
+
+    python -m benchmarks.serialization            # from backend/
+
+The "pydantic" path mirrors what the routers used to do: build a JobRead
+(with a nested CompanyRead) per row, let FastAPI validate the list against
+``response_model`` and encode it with jsonable_encoder + json.dumps.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models import JobSectorEnum, WorkTypeEnum
+from app.routers.jobs import _build_job_payload
+from app.schemas.company import CompanyRead
+from app.schemas.job import JobRead
+from app.services.serialization import dumps, orjson
+
+SIZES = [1_000, 10_000, 50_000]
+
+
+def _fake_jobs(count: int) -> list:
+    company = SimpleNamespace(
+        id="company-1",
+        name="EcoSolutions Inc.",
+        logo="https://picsum.photos/seed/comp1/100",
+        description="Pioneering sustainable solutions for a greener planet.",
+        website="https://ecosolutions.example.com",
+        is_verified=True,
+    )
+    now = datetime.utcnow()
+    sectors = list(JobSectorEnum)
+    work_types = list(WorkTypeEnum)
+    return [
+        SimpleNamespace(
+            id=f"job-{index}",
+            title=f"Solar Panel Technician {index}",
+            location="Austin, TX",
+            sector=sectors[index % len(sectors)],
+            work_type=work_types[index % len(work_types)],
+            salary_min=60000.0,
+            salary_max=80000.0,
+            posted_date=now - timedelta(minutes=index),
+            description="Install and maintain solar panels for residential and commercial clients. " * 4,
+            responsibilities=["Assemble and install solar modules.", "Perform maintenance."],
+            qualifications=["Previous experience in solar installation.", "NABCEP certification is a plus."],
+            is_third_party=False,
+            redirect_url=None,
+            company=company,
+        )
+        for index in range(count)
+    ]
+
+
+def _pydantic_job(job) -> JobRead:
+    company = job.company
+    return JobRead(
+        id=job.id,
+        title=job.title,
+        location=job.location,
+        sector=job.sector,
+        workType=job.work_type,
+        salaryRange=[job.salary_min, job.salary_max],
+        postedDate=job.posted_date,
+        description=job.description,
+        responsibilities=job.responsibilities or [],
+        qualifications=job.qualifications or [],
+        isThirdParty=job.is_third_party,
+        redirectUrl=job.redirect_url,
+        company=CompanyRead(
+            id=company.id,
+            name=company.name,
+            logo=company.logo,
+            description=company.description,
+            website=company.website,
+            isVerified=company.is_verified,
+        ),
+    )
+
+
+async def _pydantic_path(jobs: list, field) -> bytes:
+    payload = [_pydantic_job(job) for job in jobs]
+    content = await serialize_response(field=field, response_content=payload, is_coroutine=True)
+    return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+
+
+def _fast_path(jobs: list) -> bytes:
+    return dumps([_build_job_payload(job) for job in jobs])
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sizes", type=int, nargs="*", default=SIZES)
+    args = parser.parse_args()
+
+    field = create_response_field(name="response", type_=List[JobRead])
+    print(f"encoder: {'orjson' if orjson is not None else 'stdlib json'}")
+    for size in args.sizes:
+        jobs = _fake_jobs(size)
+        slow_body = asyncio.run(_pydantic_path(jobs, field))
+        fast_body = _fast_path(jobs)
+        assert json.loads(slow_body) == json.loads(fast_body), "fast path output differs"
+        slow = _best_of(args.repeat, lambda: asyncio.run(_pydantic_path(jobs, field)))
+        fast = _best_of(args.repeat, lambda: _fast_path(jobs))
+        print(f"{size:>7} jobs  pydantic {slow * 1000:9.1f}ms  fast {fast * 1000:8.1f}ms  x{slow / fast:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
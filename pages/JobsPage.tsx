@@ -9,7 +9,9 @@ import { Search, MapPin, Briefcase, SlidersHorizontal } from 'lucide-react';
 const JobsPage: React.FC = () => {
   const [searchParams, setSearchParams] = useSearchParams();
   const [jobs, setJobs] = useState<Job[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const [filters, setFilters] = useState({
     title: searchParams.get('title') || '',
@@ -20,11 +22,21 @@ const JobsPage: React.FC = () => {
   
   const fetchJobs = useCallback(async () => {
     setLoading(true);
-    const results = await getJobs(filters);
-    setJobs(results);
+    const page = await getJobs(filters);
+    setJobs(page.jobs);
+    setNextCursor(page.nextCursor);
     setLoading(false);
   }, [filters]);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    const page = await getJobs(filters, nextCursor);
+    setJobs(prev => [...prev, ...page.jobs]);
+    setNextCursor(page.nextCursor);
+    setLoadingMore(false);
+  };
+
   useEffect(() => {
     fetchJobs();
   }, [fetchJobs]);
@@ -99,9 +111,18 @@ const JobsPage: React.FC = () => {
                 ))}
             </div>
         ) : jobs.length > 0 ? (
-          <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
-            {jobs.map(job => <JobCard key={job.id} job={job} />)}
-          </div>
+          <>
+            <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
+              {jobs.map(job => <JobCard key={job.id} job={job} />)}
+            </div>
+            {nextCursor && (
+              <div className="flex justify-center mt-8">
+                <button type="button" onClick={loadMore} disabled={loadingMore} className="bg-white text-brand-green border border-brand-green py-2 px-6 rounded-md hover:bg-gray-50 transition duration-300 shadow-sm disabled:opacity-60">
+                  {loadingMore ? 'Loading...' : 'Load more jobs'}
+                </button>
+              </div>
+            )}
+          </>
         ) : (
           <div className="text-center py-16">
             <h3 className="text-xl font-semibold text-gray-700">No jobs found</h3>
@@ -4,8 +4,12 @@ import {
   Company,
   EmployeeProfile,
   Job,
+  JobFacets,
   JobFilters,
+  JobPage,
+  JobRecommendation,
   LoginData,
+  RedirectAnalytics,
   RegisterData,
   User,
   UserRole,
@@ -15,6 +19,8 @@ const inferredHostname = typeof window !== 'undefined' ? window.location.hostnam
 const defaultHost = inferredHostname === 'backend' ? 'http://backend:8000/api' : 'http://localhost:8000/api';
 const BASE_URL = (import.meta.env.VITE_API_BASE_URL || defaultHost).replace(/\/$/, '');
 
+const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
 let accessToken: string | null = null;
 
 interface RequestOptions {
@@ -47,7 +53,7 @@ const getHeaders = () => {
   return headers;
 };
 
-const request = async <T>({ path, method = 'GET', params, body }: RequestOptions): Promise<T> => {
+const send = async <T>({ path, method = 'GET', params, body }: RequestOptions): Promise<{ data: T; headers: Headers }> => {
   const url = buildUrl(path, params);
   const response = await fetch(url, {
     method,
@@ -55,7 +61,7 @@ const request = async <T>({ path, method = 'GET', params, body }: RequestOptions
     body: body ? JSON.stringify(body) : undefined,
   });
   if (response.status === 204) {
-    return undefined as unknown as T;
+    return { data: undefined as unknown as T, headers: response.headers };
   }
   let payload: unknown = null;
   try {
@@ -68,7 +74,11 @@ const request = async <T>({ path, method = 'GET', params, body }: RequestOptions
       (payload as any)?.detail || (payload as any)?.message || response.statusText || 'Something went wrong';
     throw new Error(message);
   }
-  return payload as T;
+  return { data: payload as T, headers: response.headers };
+};
+
+const request = async <T>(options: RequestOptions): Promise<T> => {
+  return (await send<T>(options)).data;
 };
 
 export const setAccessToken = (token: string | null) => {
@@ -100,8 +110,9 @@ export const getCurrentUser = (): Promise<User> => {
   return request<User>({ path: '/auth/me' });
 };
 
-export const getJobs = (filters: JobFilters): Promise<Job[]> => {
-  return request<Job[]>({ path: '/jobs', params: filters });
+export const getJobs = async (filters: JobFilters, cursor?: string): Promise<JobPage> => {
+  const { data, headers } = await send<Job[]>({ path: '/jobs', params: { ...filters, cursor } });
+  return { jobs: data, nextCursor: headers.get(NEXT_CURSOR_HEADER) };
 };
 
 export const getFeaturedJobs = (): Promise<Job[]> => {
@@ -128,6 +139,20 @@ export const getAdminStats = (): Promise<AdminStats> => {
   return request<AdminStats>({ path: '/admin/stats' });
 };
 
+export const getTopRedirects = (
+  params: { hours?: number; bucket?: 'hour' | 'day'; limit?: number } = {},
+): Promise<RedirectAnalytics> => {
+  return request<RedirectAnalytics>({ path: '/admin/redirects/top', params });
+};
+
+export const getJobFacets = (filters: JobFilters = {}): Promise<JobFacets> => {
+  return request<JobFacets>({ path: '/jobs/facets', params: filters });
+};
+
+export const getRecommendedJobs = (limit?: number): Promise<JobRecommendation[]> => {
+  return request<JobRecommendation[]>({ path: '/jobs/recommended', params: { limit } });
+};
+
 export const updateProfile = (payload: Partial<EmployeeProfile>) => {
   return request<User>({ path: '/auth/profile', method: 'PUT', body: payload });
 };
@@ -78,6 +78,7 @@ export interface Job {
   qualifications: string[];
   isThirdParty?: boolean;
   redirectUrl?: string;
+  distanceKm?: number | null;
 }
 
 export interface LoginData {
@@ -99,10 +100,23 @@ export interface AuthResponse {
 }
 
 export interface JobFilters {
+  q?: string;
   title?: string;
   location?: string;
   sector?: JobSector;
   workType?: WorkType;
+  minSalary?: number;
+  maxSalary?: number;
+  near?: string;
+  radiusKm?: number;
+  includeRemote?: boolean;
+  sort?: 'date' | 'salary' | 'relevance' | 'distance';
+}
+
+export interface JobPage {
+  jobs: Job[];
+  // Pass back to getJobs for the next page; null on the last page.
+  nextCursor: string | null;
 }
 
 export interface RedirectStat {
@@ -111,12 +125,49 @@ export interface RedirectStat {
   clicks: number;
 }
 
+export interface TopRedirect extends RedirectStat {
+  series: number[];
+}
+
+export interface RedirectAnalytics {
+  bucket: 'hour' | 'day';
+  buckets: string[];
+  jobs: TopRedirect[];
+}
+
+export interface FacetCount<T = string> {
+  value: T;
+  count: number;
+}
+
+export interface SalaryBucketCount {
+  min: number | null;
+  max: number | null;
+  count: number;
+}
+
+export interface JobFacets {
+  total: number;
+  sectors: FacetCount<JobSector>[];
+  workTypes: FacetCount<WorkType>[];
+  locations: FacetCount[];
+  salaryBuckets: SalaryBucketCount[];
+}
+
+export interface JobRecommendation {
+  job: Job;
+  score: number;
+  matchedSkills: string[];
+}
+
 export interface AdminStats {
   totalJobs: number;
   totalCompanies: number;
   totalUsers: number;
   redirects: RedirectStat[];
+  redirectsNextCursor?: string | null;
   pendingCompanies: Company[];
+  pendingNextCursor?: string | null;
 }
 
 export interface CompanyCreatePayload {